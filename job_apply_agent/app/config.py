@@ -1,54 +1,173 @@
-from pathlib import Path
+import functools
 import os
+from dataclasses import dataclass, fields
+from pathlib import Path
+
 from dotenv import load_dotenv
 
 # Project root is the folder containing 'job_apply_agent' and 'storage'
 ROOT_DIR = Path(__file__).resolve().parents[2]
-
-# Load .env file — try job_apply_agent root first, then workspace root
 JOB_APPLY_AGENT_DIR = Path(__file__).resolve().parents[1]
-env_paths = [
-    JOB_APPLY_AGENT_DIR / ".env",  # job_apply_agent/.env
-    ROOT_DIR / ".env",              # workspace root/.env
-]
-for env_file in env_paths:
-    if env_file.exists():
-        load_dotenv(env_file)
-        break
-
-STORAGE_DIR = ROOT_DIR / "storage"
-JDS_DIR = STORAGE_DIR / "jds"
-RESUME_PATH = STORAGE_DIR / "resume.pdf"
-RESUME_PROFILE_PATH = STORAGE_DIR / "resume_profile.json"
-JD_DATA_PATH = STORAGE_DIR / "current_jd.json"  # pointer to latest JD
-APPLICATIONS_LOG_PATH = STORAGE_DIR / "applications.log"
-
-# Size limit in MB (default: 10MB). Can be overridden via env var.
-MAX_RESUME_SIZE_MB = int(os.getenv("JAA_MAX_RESUME_SIZE_MB", "10"))
-MAX_RESUME_SIZE_BYTES = MAX_RESUME_SIZE_MB * 1024 * 1024
-
-# Sender email address for outgoing emails. Must be set in .env
-SENDER_EMAIL = os.getenv("SENDER_EMAIL", "")
-if not SENDER_EMAIL:
-    raise ValueError(
-        "SENDER_EMAIL not configured. Please set SENDER_EMAIL in your .env file."
+
+
+@dataclass(frozen=True, slots=True)
+class Settings:
+    """Resolved configuration. Field names are the lowercase module-level names."""
+
+    storage_dir: Path
+    jds_dir: Path
+    jd_raw_dir: Path  # original JD PDFs, named by raw-text hash
+    resume_cache_dir: Path  # parsed resumes, named by PDF hash + prompt version
+    jd_cache_dir: Path  # parsed JDs, named by upload hash + prompt version
+    email_cache_dir: Path  # generated emails, named by resume/JD/prompt hash
+    openai_cache_dir: Path  # parsed JSON responses, named by request hash
+    agent_cache_path: Path  # V2 agent results (JSONL), see v2/agents/cache.py
+    agent_usage_path: Path  # V2 agent completion sizes (JSONL), see v2/agents/_usage.py
+    resume_path: Path
+    resume_profile_path: Path
+    resume_raw_path: Path  # extracted resume text, kept out of the profile JSON
+    jd_data_path: Path  # pointer to latest JD
+    decision_path: Path  # V2 decision for the latest JD + resume
+    applications_log_path: Path
+
+    max_resume_size_mb: int
+    max_resume_size_bytes: int
+    max_jd_text_chars: int
+    agent_max_concurrency: int
+    analyzer_model: str  # JD/resume analysis and the first decision attempt
+    decision_model: str  # unsure (low-confidence) decisions and the combined agent
+    openai_rpm_limit: int  # 0 disables the limit
+    openai_tpm_limit: int
+    log_level: str  # level of the app's loggers (see main.py)
+
+    sender_email: str
+
+    smtp_host: str
+    smtp_port: int
+    smtp_user: str
+    smtp_password: str
+    smtp_use_tls: bool
+
+
+def _load_env_file() -> None:
+    # Load .env file — try job_apply_agent root first, then workspace root
+    env_paths = [
+        JOB_APPLY_AGENT_DIR / ".env",  # job_apply_agent/.env
+        ROOT_DIR / ".env",              # workspace root/.env
+    ]
+    for env_file in env_paths:
+        if env_file.exists():
+            load_dotenv(env_file)
+            break
+
+
+@functools.cache
+def get_settings() -> Settings:
+    """Discover .env and read environment variables (once per process).
+
+    Only reads the environment, so importing the app has no side effects:
+    SENDER_EMAIL is checked by require_sender_email() and the storage
+    directories are created by ensure_storage_dirs(), where they are needed.
+    """
+    _load_env_file()
+
+    storage_dir = ROOT_DIR / "storage"
+
+    # Size limit in MB (default: 10MB). Can be overridden via env var.
+    max_resume_size_mb = int(os.getenv("JAA_MAX_RESUME_SIZE_MB", "10"))
+
+    settings = Settings(
+        storage_dir=storage_dir,
+        jds_dir=storage_dir / "jds",
+        jd_raw_dir=storage_dir / "jds" / "raw",
+        resume_cache_dir=storage_dir / "resume_cache",
+        jd_cache_dir=storage_dir / "jd_cache",
+        email_cache_dir=storage_dir / "email_cache",
+        openai_cache_dir=storage_dir / "openai_cache",
+        agent_cache_path=storage_dir / "agent_cache.jsonl",
+        agent_usage_path=storage_dir / "agent_usage.jsonl",
+        resume_path=storage_dir / "resume.pdf",
+        resume_profile_path=storage_dir / "resume_profile.json",
+        resume_raw_path=storage_dir / "resume_raw.txt",
+        jd_data_path=storage_dir / "current_jd.json",
+        decision_path=storage_dir / "decision.json",
+        applications_log_path=storage_dir / "applications.log",
+        max_resume_size_mb=max_resume_size_mb,
+        max_resume_size_bytes=max_resume_size_mb * 1024 * 1024,
+        # JD text kept for prompts/storage is capped (default: 16K chars)
+        max_jd_text_chars=int(os.getenv("JAA_MAX_JD_TEXT_CHARS", "16384")),
+        # Cap on concurrent OpenAI requests in batch decisions (default: 4)
+        agent_max_concurrency=int(os.getenv("JAA_AGENT_MAX_CONCURRENCY", "4")),
+        # V2 agents: a small, fast model for extraction; the larger one when a decision is unclear
+        analyzer_model=os.getenv("JAA_ANALYZER_MODEL", "gpt-4.1-nano"),
+        decision_model=os.getenv("JAA_DECISION_MODEL", "gpt-4o-mini"),
+        # Account rate limits the V2 agents pace themselves to (0 = no limit)
+        openai_rpm_limit=int(os.getenv("JAA_OPENAI_RPM_LIMIT", "500")),
+        openai_tpm_limit=int(os.getenv("JAA_OPENAI_TPM_LIMIT", "200000")),
+        # e.g. DEBUG to see the V2 agents' token usage lines (default: INFO)
+        log_level=os.getenv("JAA_LOG_LEVEL", "INFO").upper(),
+        # Sender email address for outgoing emails. Must be set in .env
+        sender_email=os.getenv("SENDER_EMAIL", ""),
+        # SMTP Configuration for email sending (Phase 5)
+        smtp_host=os.getenv("SMTP_HOST", ""),
+        smtp_port=int(os.getenv("SMTP_PORT", "587")),  # Default to TLS port
+        smtp_user=os.getenv("SMTP_USER", ""),
+        smtp_password=os.getenv("SMTP_PASSWORD", ""),
+        smtp_use_tls=os.getenv("SMTP_USE_TLS", "true").lower() in ("true", "1", "yes"),
     )
 
-# SMTP Configuration for email sending (Phase 5)
-SMTP_HOST = os.getenv("SMTP_HOST", "")
-SMTP_PORT = int(os.getenv("SMTP_PORT", "587"))  # Default to TLS port
-SMTP_USER = os.getenv("SMTP_USER", "")
-SMTP_PASSWORD = os.getenv("SMTP_PASSWORD", "")
-SMTP_USE_TLS = os.getenv("SMTP_USE_TLS", "true").lower() in ("true", "1", "yes")
+    return settings
+
+
+@functools.cache
+def ensure_storage_dirs() -> None:
+    """Create storage/ and its subdirectories (safe, idempotent; once per process).
+
+    Called before the first write into storage/, not at import.
+    """
+    settings = get_settings()
+    for directory in (
+        settings.storage_dir,
+        settings.jds_dir,
+        settings.jd_raw_dir,
+        settings.resume_cache_dir,
+        settings.jd_cache_dir,
+        settings.email_cache_dir,
+        settings.openai_cache_dir,
+    ):
+        directory.mkdir(parents=True, exist_ok=True)
+
+
+def require_sender_email() -> str:
+    """Return SENDER_EMAIL, checked when an email is composed or sent.
+
+    Raises:
+        ValueError: If SENDER_EMAIL is not configured
+    """
+    sender_email = get_settings().sender_email
+    if not sender_email:
+        raise ValueError(
+            "SENDER_EMAIL not configured. Please set SENDER_EMAIL in your .env file."
+        )
+    return sender_email
+
+
+_SETTING_FIELDS = frozenset(f.name for f in fields(Settings))
+
+
+def __getattr__(name: str):
+    # Serve STORAGE_DIR, SMTP_HOST, ... from the cached settings on first access
+    field = name.lower()
+    if name.isupper() and field in _SETTING_FIELDS:
+        return getattr(get_settings(), field)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 # Validate SMTP config only if email sending will be used
 def validate_smtp_config():
     """Validate that all SMTP settings are configured."""
-    if not all([SMTP_HOST, SMTP_USER, SMTP_PASSWORD]):
+    settings = get_settings()
+    if not all([settings.smtp_host, settings.smtp_user, settings.smtp_password]):
         raise ValueError(
             "SMTP not fully configured. Please set SMTP_HOST, SMTP_USER, SMTP_PASSWORD in .env"
         )
-
-# Ensure storage directories exist (safe, idempotent)
-STORAGE_DIR.mkdir(parents=True, exist_ok=True)
-JDS_DIR.mkdir(parents=True, exist_ok=True)
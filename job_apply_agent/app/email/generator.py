@@ -1,34 +1,46 @@
 """Email generation for cold job applications."""
 
-import json
+import asyncio
+import functools
 import re
-from typing import Any, Dict, List, Tuple
+from dataclasses import dataclass
+from typing import Any, Dict, List, Set, Tuple
 
-import openai
-
-from ..config import JD_DATA_PATH, RESUME_PROFILE_PATH, SENDER_EMAIL
-from ..utils.openai_utils import ensure_api_key_set
+from ..config import JD_DATA_PATH, RESUME_PROFILE_PATH, RESUME_RAW_PATH, require_sender_email
+from ..utils.cache_utils import content_hash, load_json_cached
+from ..utils.openai_utils import bind_http_session, ensure_api_key_set
+from .store import cache_email, email_cache_key, load_cached_email
 
 
 def load_resume_profile() -> Dict[str, Any]:
     """Load the parsed resume profile from storage.
     
     Returns:
-        Dict with resume data (name, current_title, summary, skills, experience, projects, raw_text)
+        Dict with resume data (name, current_title, summary, skills, experience, projects).
+        The extracted resume text is stored separately; see load_resume_raw().
         
     Raises:
         FileNotFoundError: If resume profile not found
         ValueError: If profile is invalid JSON
     """
-    if not RESUME_PROFILE_PATH.exists():
+    try:
+        return load_json_cached(RESUME_PROFILE_PATH)
+    except FileNotFoundError:
         raise FileNotFoundError(
             "Resume profile not found. Please upload and parse a resume first via POST /resume."
-        )
-    
-    with RESUME_PROFILE_PATH.open("r", encoding="utf-8") as f:
-        profile = json.load(f)
-    
-    return profile
+        ) from None
+
+
+def load_resume_raw() -> str:
+    """Load the extracted resume text stored alongside the profile.
+
+    Returns:
+        Resume text, or an empty string if none has been stored
+    """
+    try:
+        return RESUME_RAW_PATH.read_bytes().decode("utf-8")
+    except FileNotFoundError:
+        return ""
 
 
 def _strip_list(items: List[str]) -> List[str]:
@@ -45,15 +57,12 @@ def load_jd_data() -> Dict[str, Any]:
         FileNotFoundError: If JD data not found
         ValueError: If data is invalid JSON
     """
-    if not JD_DATA_PATH.exists():
+    try:
+        return load_json_cached(JD_DATA_PATH)
+    except FileNotFoundError:
         raise FileNotFoundError(
             "Job description not found. Please submit a JD via POST /apply first."
-        )
-    
-    with JD_DATA_PATH.open("r", encoding="utf-8") as f:
-        jd_data = json.load(f)
-    
-    return jd_data
+        ) from None
 
 
 def normalize_jd(jd_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -99,7 +108,7 @@ HUMANIZATION_RULES = """Humanization rules:
 - Close softly: "Resume attached. Happy to share more details if useful."""
 
 
-BANNED_PHRASES = {
+BANNED_PHRASES = frozenset({
     "solid background",
     "hands-on experience",
     "extensive experience",
@@ -114,18 +123,17 @@ BANNED_PHRASES = {
     "thrilled",
     "dear hiring manager",
     "to whom it may concern",
-}
+})
 
 
 def _sanitize_banned(text: str) -> str:
-    cleaned = text
-    for phrase in BANNED_PHRASES:
-        cleaned = re.sub(re.escape(phrase), "", cleaned, flags=re.IGNORECASE)
+    # One pass over the longest-first alternation of all banned phrases
+    cleaned = _BANNED_RE.sub("", text)
     # Collapse double spaces/newlines that may result
-    cleaned = re.sub(r"\s+", " ", cleaned).strip()
+    cleaned = _WS_RE.sub(" ", cleaned).strip()
     return cleaned
 
-GENERIC_TEMPLATES = {
+GENERIC_TEMPLATES = frozenset({
     "i am writing to apply",
     "i'm writing to apply",
     "please find my resume attached",
@@ -133,9 +141,9 @@ GENERIC_TEMPLATES = {
     "thank you for your time and consideration",
     "i believe i am a great fit",
     "with x years of experience",
-}
+})
 
-ADJECTIVES = {
+ADJECTIVES = frozenset({
     "innovative",
     "dynamic",
     "motivated",
@@ -147,9 +155,9 @@ ADJECTIVES = {
     "strategic",
     "proactive",
     "fast-paced",
-}
+})
 
-VERBS = {
+VERBS = frozenset({
     "built",
     "shipped",
     "designed",
@@ -170,38 +178,151 @@ VERBS = {
     "applied",
     "integrating",
     "experimented",
-}
+})
 
-RESUME_SUMMARY_MARKERS = {
+RESUME_SUMMARY_MARKERS = frozenset({
     "professional summary",
     "summary",
     "experience includes",
     "years of experience",
     "proven track record",
-}
+})
+
+
+def _phrase_pattern(phrases) -> re.Pattern:
+    # Longest phrases first so overlapping alternatives prefer the longer match
+    ordered = sorted(phrases, key=len, reverse=True)
+    return re.compile("|".join(re.escape(p) for p in ordered), re.IGNORECASE)
+
+
+# Compiled once at import; each phrase set is matched in a single scan
+_BANNED_RE = _phrase_pattern(BANNED_PHRASES)
+_GENERIC_RE = _phrase_pattern(GENERIC_TEMPLATES)
+_WS_RE = re.compile(r"\s+")
+_SENT_RE = re.compile(rb"[.!?]+\s*")
+# Applied to lowercased ASCII bytes; hyphens and digits split words, as in the str patterns
+_WORD_RE = re.compile(rb"[a-z']+")
+# Words the JD-overlap check compares (4+ letters, no apostrophes)
+_LONG_WORD_RE = re.compile(rb"[a-z]{4,}")
+# Stripped from whitespace-separated words before the adjective/verb lookup
+_EDGE_PUNCTUATION = ".,!?:;()[]{}\"'\n\r"
+_SENT_BOUNDARY_RE = re.compile(r"(?<=[.!?])\s+")
+
 
+NOUN_SUFFIXES = frozenset({"ion", "ment", "ness", "ity", "ence", "ance", "ism"})
+# Suffixes split by length so classification is two set lookups per word
+_NOUN_SUFFIXES_3 = frozenset(x.encode() for x in NOUN_SUFFIXES if len(x) == 3)
+_NOUN_SUFFIXES_4 = frozenset(x.encode() for x in NOUN_SUFFIXES if len(x) == 4)
 
-def _word_count(text: str) -> int:
-    return len([w for w in re.split(r"\s+", text.strip()) if w])
+# Byte-keyed copy for the tokenizer, which works on encoded text
+_VERBS_B = frozenset(v.encode() for v in VERBS)
 
 
-def _adjective_heavy(text: str) -> bool:
-    words = [w.strip(".,!?:;()[]{}\"'\n\r").lower() for w in re.split(r"\s+", text) if w]
-    adj = sum(1 for w in words if w in ADJECTIVES or w.endswith("ive"))
-    verbs = sum(1 for w in words if w in VERBS)
-    return adj > max(verbs, 1) + 2
+def _encode_ascii(text: str) -> bytes:
+    # Non-ASCII chars become "&#NNNN;", which neither joins words nor ends a sentence,
+    # so tokens and sentence splits match what the str regexes produced
+    return text.encode("ascii", "xmlcharrefreplace")
+
+
+def _tokenize(text: str) -> List[bytes]:
+    # Lowercased after encoding, as the [a-zA-Z'] tokenizers matched before lowering:
+    # str.lower() turns some non-ASCII letters into ASCII ones ("İ" -> "i" + U+0307,
+    # the Kelvin sign -> "k"), which would otherwise join or split words
+    return _WORD_RE.findall(_encode_ascii(text).lower())
+
+
+def _long_word_set(text_lower: str) -> Set[bytes]:
+    # The JD-overlap check lowered before matching, so this one takes lowercased text
+    return set(_LONG_WORD_RE.findall(_encode_ascii(text_lower)))
+
+
+@dataclass
+class TokenStats:
+    """Word-level statistics for one email, built once per validation.
+
+    Body-only fields feed the claim/noun/summary checks; ``lower``, ``word_set``,
+    ``adj_count`` and ``full_verb_count`` also cover the subject and signature.
+    The adjective counters use whitespace-separated words (so "detail-oriented"
+    stays whole), the rest use letter runs, matching the per-check tokenizers
+    they replace. As there, letter runs are found before lowercasing in the
+    claim and noun counts and after it in ``word_set``.
+    """
+
+    lower: str
+    body_lower: str
+    lines: List[str]
+    word_count: int
+    words: List[bytes]
+    sentences: List[bytes]
+    sentence_words: List[List[bytes]]
+    word_set: Set[bytes]
+    verb_count: int
+    noun_suffix_count: int
+    adj_count: int
+    full_verb_count: int
+
+
+def _token_stats(subject: str, body: str, signature: str = "") -> TokenStats:
+    """Tokenize the email in a single pass and collect every counter the validators need."""
+    body_lower = body.lower()
+    lower = f"{subject}\n{body}\n{signature}".lower()
+
+    words: List[bytes] = []
+    sentences: List[bytes] = []
+    sentence_words: List[List[bytes]] = []
+    verbs = nouns = 0
+
+    for sentence in _SENT_RE.split(_encode_ascii(body).lower()):  # see _tokenize
+        if not sentence.strip():
+            continue
+        tokens = _WORD_RE.findall(sentence)
+        sentences.append(sentence)
+        sentence_words.append(tokens)
+        for w in tokens:
+            words.append(w)
+            if w in _VERBS_B:
+                verbs += 1
+            if w[-3:] in _NOUN_SUFFIXES_3 or w[-4:] in _NOUN_SUFFIXES_4:
+                nouns += 1
+
+    # Adjectives vs verbs over the whole email, on whitespace-separated words
+    full_adj = full_verbs = 0
+    for w in lower.split():
+        w = w.strip(_EDGE_PUNCTUATION)
+        if w in ADJECTIVES or w.endswith("ive"):
+            full_adj += 1
+        if w in VERBS:
+            full_verbs += 1
+
+    return TokenStats(
+        lower=lower,
+        body_lower=body_lower,
+        lines=body.splitlines(),
+        word_count=len(body.split()),
+        words=words,
+        sentences=sentences,
+        sentence_words=sentence_words,
+        word_set=_long_word_set(lower),
+        verb_count=verbs,
+        noun_suffix_count=nouns,
+        adj_count=full_adj,
+        full_verb_count=full_verbs,
+    )
+
+
+def _adjective_heavy(stats: TokenStats) -> bool:
+    return stats.adj_count > max(stats.full_verb_count, 1) + 2
 
 
 def _contains_banned_phrase(text: str) -> Tuple[bool, str]:
-    lower = text.lower()
-    for phrase in BANNED_PHRASES:
-        if phrase in lower:
-            return True, phrase
+    match = _BANNED_RE.search(text)
+    if match:
+        return True, match.group(0).lower()
     return False, ""
 
 
-def _contains_bullets(text: str) -> bool:
-    for line in text.splitlines():
+def _contains_bullets(lines: List[str]) -> bool:
+    for line in lines:
         stripped = line.strip().lower()
         if stripped.startswith(('-', '*', '•')):
             return True
@@ -209,10 +330,9 @@ def _contains_bullets(text: str) -> bool:
 
 
 def _reads_generic_template(text: str) -> Tuple[bool, str]:
-    lower = text.lower()
-    for phrase in GENERIC_TEMPLATES:
-        if phrase in lower:
-            return True, phrase
+    match = _GENERIC_RE.search(text)
+    if match:
+        return True, match.group(0).lower()
     return False, ""
 
 
@@ -228,66 +348,61 @@ def _resume_corpus(profile: Dict[str, Any]) -> str:
     return " \n".join(parts).lower()
 
 
-def _count_claims(body: str) -> int:
-    # Heuristic: each sentence-like chunk with a verb counts as a claim
-    chunks = re.split(r"[.!?]+\s*", body)
+MAX_CLAIMS = 3
+
+
+def _count_claims(stats: TokenStats, limit: int | None = None) -> int:
+    # Heuristic: each sentence-like chunk with a verb counts as a claim.
+    # With a limit, stop as soon as the count exceeds it; the verdict is settled.
     claims = 0
-    for chunk in chunks:
-        words = [w.lower() for w in re.findall(r"[a-zA-Z']+", chunk)]
-        if not words:
-            continue
-        if any(w in VERBS for w in words):
+    for words in stats.sentence_words:
+        if any(w in _VERBS_B for w in words):
             claims += 1
+            if limit is not None and claims > limit:
+                break
     return claims
 
 
-def _noun_heavy(body: str) -> bool:
-    words = [w.lower() for w in re.findall(r"[a-zA-Z']+", body)]
-    if not words:
+def _noun_heavy(stats: TokenStats) -> bool:
+    if not stats.words:
         return False
-    verbs = sum(1 for w in words if w in VERBS)
-    nouns = sum(1 for w in words if w.endswith(("ion", "ment", "ness", "ity", "ence", "ance", "ism")))
-    return nouns > verbs * 2 + 2
+    return stats.noun_suffix_count > stats.verb_count * 2 + 2
 
 
-def _looks_like_resume_summary(body: str) -> bool:
-    lower = body.lower()
-    if any(marker in lower for marker in RESUME_SUMMARY_MARKERS):
+def _looks_like_resume_summary(stats: TokenStats) -> bool:
+    if any(marker in stats.body_lower for marker in RESUME_SUMMARY_MARKERS):
         return True
     # If first line lists multiple commas with no verbs, treat as summary-like
-    first_line = body.splitlines()[0] if body.splitlines() else ""
+    first_line = stats.lines[0] if stats.lines else ""
     verb_present = any(v in first_line.lower().split() for v in VERBS)
     comma_count = first_line.count(",")
     return comma_count >= 2 and not verb_present
 
 
-def _paragraphs_ok(body: str) -> bool:
+def _paragraphs_ok(stats: TokenStats) -> bool:
     # Simplified: ensure total sentences are reasonable (<= 6). Do not hard-fail on layout.
-    sentences = [s for s in re.split(r"[.!?]+\s*", body) if s.strip()]
-    return 0 < len(sentences) <= 6
+    return 0 < len(stats.sentences) <= 6
 
 
-def _mentions_unbacked_jd_skills(email_text: str, resume_profile: Dict[str, Any], jd_data: Dict[str, Any]) -> Tuple[bool, str]:
-    email_lower = email_text.lower()
-    resume_blob = _resume_corpus(resume_profile)
-    for skill in jd_data.get("key_skills", []) or []:
-        s = str(skill).strip().lower()
-        if not s:
-            continue
-        if s in email_lower and s not in resume_blob:
+def _normalized_jd_skills(jd_data: Dict[str, Any]) -> List[str]:
+    return [str(s).strip().lower() for s in jd_data.get("key_skills", []) or [] if str(s).strip()]
+
+
+def _mentions_unbacked_jd_skills(stats: TokenStats, resume_blob: str, jd_skills: List[str]) -> Tuple[bool, str]:
+    for skill in jd_skills:
+        if skill in stats.lower and skill not in resume_blob:
             return True, skill
     return False, ""
 
 
-def _repeats_jd_language(email_text: str, jd_summary: str) -> bool:
+def _repeats_jd_language(stats: TokenStats, jd_summary: str) -> bool:
     jd_summary = jd_summary or ""
     if not jd_summary.strip():
         return False
-    email_words = {w for w in re.findall(r"[a-zA-Z]{4,}", email_text.lower())}
-    jd_words = {w for w in re.findall(r"[a-zA-Z]{4,}", jd_summary.lower())}
+    jd_words = _jd_word_set(jd_summary)
     if not jd_words:
         return False
-    overlap = len(email_words & jd_words) / max(len(jd_words), 1)
+    overlap = len(stats.word_set & jd_words) / max(len(jd_words), 1)
     return overlap > 0.6
 
 
@@ -296,10 +411,6 @@ def _build_context(resume_profile: Dict[str, Any], jd_data: Dict[str, Any]) -> s
     role = jd_data.get("role", "") or ""
     jd_summary_raw = (jd_data.get("summary", "") or "").strip()
 
-    # Limit JD summary to max 3 short lines to avoid copy/paste tone
-    jd_sentences = re.split(r"(?<=[.!?])\s+", jd_summary_raw)
-    jd_summary = " ".join(jd_sentences[:3]).strip()
-
     # Resume summary: single line
     resume_summary = (resume_profile.get("summary", "") or resume_profile.get("current_title", "") or "").strip()
 
@@ -317,10 +428,23 @@ def _build_context(resume_profile: Dict[str, Any], jd_data: Dict[str, Any]) -> s
             if str(block).strip():
                 highlights.append(str(block).strip())
 
-    highlights = highlights[:2]
+    return _render_context(company, role, jd_summary_raw, resume_summary, tuple(highlights[:2]))
+
+
+@functools.lru_cache(maxsize=128)
+def _render_context(
+    company: str,
+    role: str,
+    jd_summary_raw: str,
+    resume_summary: str,
+    highlights: Tuple[str, ...],
+) -> str:
+    # Limit JD summary to max 3 short lines to avoid copy/paste tone
+    jd_sentences = _SENT_BOUNDARY_RE.split(jd_summary_raw)
+    jd_summary = " ".join(jd_sentences[:3]).strip()
 
     # Keep format even if empty to avoid the model guessing
-    highlights_section = "\n".join(f"- {line}" if line else "- " for line in (highlights or [""]))
+    highlights_section = "\n".join(f"- {line}" if line else "- " for line in (highlights or ("",)))
 
     context = f"""Company Name: {company}
 Role Title: {role}
@@ -337,8 +461,7 @@ Relevant Resume Highlights:
     return context
 
 
-def _build_user_prompt(context: str) -> str:
-    examples = """
+_EXAMPLES_BLOCK = """
 Example 1:
 I’m reaching out regarding this role. My background is in backend engineering, and my recent work has focused on building LLM-powered prototypes and systems.
 
@@ -368,9 +491,9 @@ At Zuru Tech, I worked on designing scalable APIs, and more recently I’ve buil
 Resume attached. Happy to share more details if useful.
 """
 
-    return f"""{context}
-
-Behavioral Constraints:
+# Static part of the user prompt. It comes first so every request shares the same
+# token prefix (eligible for OpenAI prompt caching); the context is appended last.
+_USER_PROMPT_PREFIX = """Behavioral Constraints:
 - Never invent or embellish.
 - Skip any detail that is missing or unclear.
 - Prefer silence over guessing.
@@ -388,7 +511,7 @@ Style Rules:
 - No bullet points or skill lists.
 
 Humanization:
-{HUMANIZATION_RULES}
+""" + HUMANIZATION_RULES + """
 
 Output Format (strict):
 Subject: Application – <Role or "This Role">
@@ -407,10 +530,16 @@ Rules:
 - Match the tone and structure of the provided examples (short opener about role + 1-2 concrete work sentences + closing line)
 
 Style Examples (imitate closely):
-{examples}
+""" + _EXAMPLES_BLOCK + """
+Write the email for this context:
+
 """
 
 
+def _build_user_prompt(context: str) -> str:
+    return _USER_PROMPT_PREFIX + context
+
+
 def _parse_generated_email(text: str) -> Tuple[str, str, str]:
     subject = ""
     body_lines: List[str] = []
@@ -450,55 +579,122 @@ def _parse_generated_email(text: str) -> Tuple[str, str, str]:
     return subject, body, ""
 
 
-def _validate_email_output(subject: str, body: str, signature: str, resume_profile: Dict[str, Any], jd_data: Dict[str, Any]) -> Tuple[bool, str]:
-    full_text = f"{subject}\n{body}\n{signature}"
+CLOSING_LINE = "Resume attached. Happy to share more details if useful."
+REASON_TOO_MANY_CLAIMS = "Too many claims"
+REASON_REPEATS_JD = "Repeats JD language too closely"
+
+# A sentence with its leading whitespace; sentences never run across a line break
+_SENT_SPAN_RE = re.compile(r"(\s*)(\S[^.!?\n]*(?:[.!?]+|$))", re.MULTILINE)
+
+
+def _jd_word_set(jd_summary: str) -> Set[bytes]:
+    return _long_word_set((jd_summary or "").lower())
 
-    wc = _word_count(body)
-    if wc > 120:
+
+def _repair_email(body: str, reason: str, jd_summary: str) -> str | None:
+    """Try to fix a failed body locally by dropping sentences.
+
+    Handles "too many claims" (keep the first MAX_CLAIMS claim sentences) and
+    "repeats JD language" (drop the sentence sharing the most words with the JD).
+    Sentences from the required closing line are never dropped, and the
+    whitespace between the kept sentences (paragraph breaks included) is
+    left as it was. Returns the repaired body, or None if the failure is not
+    locally repairable.
+    """
+    spans = [(m.group(1), m.group(2).strip()) for m in _SENT_SPAN_RE.finditer(body)]
+    sentences = [sent for _, sent in spans]
+    closing = CLOSING_LINE.lower()
+    removable = [i for i, sent in enumerate(sentences) if sent.lower() not in closing]
+    drop: Set[int] = set()
+
+    if reason == REASON_TOO_MANY_CLAIMS:
+        claims = 0
+        for i in removable:
+            if any(w in _VERBS_B for w in _tokenize(sentences[i])):
+                claims += 1
+                if claims > MAX_CLAIMS:
+                    drop.add(i)
+    elif reason == REASON_REPEATS_JD:
+        jd_words = _jd_word_set(jd_summary)
+        overlaps = {i: len(_long_word_set(sentences[i].lower()) & jd_words) for i in removable}
+        if overlaps:
+            worst = max(overlaps, key=overlaps.get)
+            if overlaps[worst]:
+                drop.add(worst)
+
+    # Nothing to drop, or dropping would leave only the closing line
+    if not drop or len(drop) >= len(removable):
+        return None
+
+    parts: List[str] = []
+    carried = ""  # separator of a dropped sentence, kept if it was a line break
+    for i, (separator, sent) in enumerate(spans):
+        if i in drop:
+            if separator.count("\n") > carried.count("\n"):
+                carried = separator
+            continue
+        if carried.count("\n") > separator.count("\n"):
+            separator = carried
+        carried = ""
+        parts.append(separator + sent)
+    return "".join(parts).strip()
+
+
+def _validate_email_output(
+    subject: str,
+    body: str,
+    signature: str,
+    resume_blob: str,
+    jd_skills: List[str],
+    jd_summary: str,
+) -> Tuple[bool, str]:
+    stats = _token_stats(subject, body, signature)
+
+    if stats.word_count > 120:
         return False, "Word count exceeds 120"
 
-    claims = _count_claims(body)
-    if claims > 3:
-        return False, "Too many claims"
+    claims = _count_claims(stats, limit=MAX_CLAIMS)
+    if claims > MAX_CLAIMS:
+        return False, REASON_TOO_MANY_CLAIMS
 
-    banned, phrase = _contains_banned_phrase(full_text)
+    banned, phrase = _contains_banned_phrase(stats.lower)
     if banned:
         return False, f"Contains banned phrase: {phrase}"
 
-    generic, phrase = _reads_generic_template(full_text)
+    generic, phrase = _reads_generic_template(stats.lower)
     if generic:
         return False, f"Generic template language detected: {phrase}"
 
-    if _adjective_heavy(full_text):
+    if _adjective_heavy(stats):
         return False, "Too many adjectives vs verbs"
 
-    if _noun_heavy(body):
+    if _noun_heavy(stats):
         return False, "Too noun-heavy vs verbs"
 
-    if _looks_like_resume_summary(body):
+    if _looks_like_resume_summary(stats):
         return False, "Reads like a resume summary"
 
-    if _repeats_jd_language(full_text, jd_data.get("summary", "")):
-        return False, "Repeats JD language too closely"
+    if _repeats_jd_language(stats, jd_summary):
+        return False, REASON_REPEATS_JD
 
-    unbacked, skill = _mentions_unbacked_jd_skills(full_text, resume_profile, jd_data)
+    unbacked, skill = _mentions_unbacked_jd_skills(stats, resume_blob, jd_skills)
     if unbacked:
         return False, f"Mentions skill not in resume: {skill}"
 
-    if _contains_bullets(body):
+    if _contains_bullets(stats.lines):
         return False, "Contains bullet points"
 
     # Placeholder/signature leakage guard
-    lower_body = body.lower()
+    lower_body = stats.body_lower
     if "<name" in lower_body or "signature:" in lower_body:
         return False, "Contains placeholder or signature markers"
 
     # Require closing line
-    closing = "resume attached. happy to share more details if useful."
+    closing = CLOSING_LINE.lower()
     if closing not in lower_body:
         return False, "Missing required closing line"
 
-    if not _paragraphs_ok(body):
+    if not _paragraphs_ok(stats):
         return False, "Paragraph structure not in expected 2-3 short paragraphs"
 
     if not body:
@@ -507,51 +703,105 @@ def _validate_email_output(subject: str, body: str, signature: str, resume_profi
     return True, ""
 
 
-def generate_email(resume_profile: Dict[str, Any], jd_data: Dict[str, Any]) -> Dict[str, str]:
-    """Generate a cold, startup-style application email with validation and retries."""
+# Total model calls allowed per email, and how many of them run speculatively in parallel
+MAX_GENERATION_ATTEMPTS = 3
+PARALLEL_GENERATION_ATTEMPTS = 2
+# Local sentence-dropping repairs tried on a response before it counts as failed
+MAX_LOCAL_REPAIRS = 2
+
+
+async def _generate_attempt(
+    user_prompt: str,
+    resume_blob: str,
+    jd_skills: List[str],
+    jd_summary: str,
+) -> Tuple[Dict[str, str] | None, str]:
+    """Run one generation call and validate it. Returns (email, "") or (None, reason)."""
+    import openai  # deferred: only generation pays the import cost
+
+    bind_http_session()
+    response = await openai.ChatCompletion.acreate(
+        model="gpt-4o-mini",
+        messages=[
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": user_prompt},
+        ],
+        temperature=0.4,
+        max_tokens=500,
+    )
+
+    raw_output = response["choices"][0]["message"]["content"].strip()
+    subject, body, _ = _parse_generated_email(raw_output)
+
+    # Sanitize banned phrases before validation
+    subject = _sanitize_banned(subject)
+    body = _sanitize_banned(body)
+
+    # Validate pre-signature append; repair locally before spending another call
+    for _ in range(MAX_LOCAL_REPAIRS + 1):
+        valid, reason = _validate_email_output(subject, body, "", resume_blob, jd_skills, jd_summary)
+        if valid:
+            return {"subject": subject, "body": body, "signature": ""}, ""
+        repaired = _repair_email(body, reason, jd_summary)
+        if repaired is None:
+            break
+        body = repaired
+    return None, reason
+
+
+# Part of the email cache key, so prompt edits invalidate cached emails
+_PROMPT_VERSION = content_hash(f"{SYSTEM_PROMPT}\0{_USER_PROMPT_PREFIX}".encode("utf-8"))[:12]
+
+
+async def generate_email(resume_profile: Dict[str, Any], jd_data: Dict[str, Any]) -> Dict[str, str]:
+    """Generate a cold, startup-style application email with validation and retries.
+
+    Starts PARALLEL_GENERATION_ATTEMPTS calls at once and returns the first one that
+    passes validation, cancelling the rest. Each failure launches a replacement until
+    MAX_GENERATION_ATTEMPTS calls have been made.
+    """
 
     ensure_api_key_set()
 
     context = _build_context(resume_profile, jd_data)
     user_prompt = _build_user_prompt(context)
 
-    attempts = 0
+    # Inputs to validation are fixed across retries; build them once
+    resume_blob = _resume_corpus(resume_profile)
+    jd_skills = _normalized_jd_skills(jd_data)
+    jd_summary = jd_data.get("summary", "") or ""
+
+    def launch() -> asyncio.Task:
+        return asyncio.ensure_future(_generate_attempt(user_prompt, resume_blob, jd_skills, jd_summary))
+
+    pending = {launch() for _ in range(min(PARALLEL_GENERATION_ATTEMPTS, MAX_GENERATION_ATTEMPTS))}
+    launched = len(pending)
     last_error = ""
 
-    while attempts < 3:
-        try:
-            response = openai.ChatCompletion.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": SYSTEM_PROMPT},
-                    {"role": "user", "content": user_prompt},
-                ],
-                temperature=0.4,
-                max_tokens=500,
-            )
-
-            raw_output = response["choices"][0]["message"]["content"].strip()
-            subject, body, _ = _parse_generated_email(raw_output)
-
-            # Sanitize banned phrases before validation
-            subject = _sanitize_banned(subject)
-            body = _sanitize_banned(body)
-
-            # Validate pre-signature append
-            valid, reason = _validate_email_output(subject, body, "", resume_profile, jd_data)
-            if valid:
-                return {"subject": subject, "body": body, "signature": ""}
-
-            last_error = reason
-            attempts += 1
-        except Exception as e:
-            last_error = str(e)
-            attempts += 1
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                try:
+                    generated, reason = task.result()
+                except Exception as e:
+                    generated, reason = None, str(e)
+
+                if generated is not None:
+                    return generated
+
+                last_error = reason
+                if launched < MAX_GENERATION_ATTEMPTS:
+                    pending.add(launch())
+                    launched += 1
+    finally:
+        for task in pending:
+            task.cancel()
 
     raise ValueError(f"Failed to generate email after validation: {last_error}")
 
 
-def compose_full_email(resume_profile: Dict[str, Any], jd_data: Dict[str, Any], recipient_email: str = None) -> Dict[str, str]:
+async def compose_full_email(resume_profile: Dict[str, Any], jd_data: Dict[str, Any], recipient_email: str = None) -> Dict[str, str]:
     """Compose a complete email with salutation, body, and closing.
     
     Args:
@@ -568,8 +818,10 @@ def compose_full_email(resume_profile: Dict[str, Any], jd_data: Dict[str, Any],
             - from: Sender email
             
     Raises:
-        ValueError: If no email found in JD and recipient_email not provided
+        ValueError: If no email found in JD and recipient_email not provided,
+                    or SENDER_EMAIL is not configured
     """
+    sender_email = require_sender_email()
     jd_data = normalize_jd(jd_data)
     company = jd_data.get("company", "").strip()
     role = jd_data.get("role", "").strip()
@@ -582,8 +834,13 @@ def compose_full_email(resume_profile: Dict[str, Any], jd_data: Dict[str, Any],
             "No recipient email found. Please provide email as query parameter: ?email=hiring@company.com"
         )
     
-    # Generate email content with validation/regeneration
-    generated = generate_email(resume_profile, jd_data)
+    # Generate email content with validation/regeneration, unless these exact
+    # inputs were already generated (e.g. /generate-email before /send-email)
+    cache_key = email_cache_key(resume_profile, jd_data, _PROMPT_VERSION)
+    generated = await asyncio.to_thread(load_cached_email, cache_key)
+    if generated is None:
+        generated = await generate_email(resume_profile, jd_data)
+        await asyncio.to_thread(cache_email, cache_key, generated)
 
     # Subject: prefer model output; fallback follows required pattern
     subject = generated.get("subject", "").strip()
@@ -603,7 +860,7 @@ def compose_full_email(resume_profile: Dict[str, Any], jd_data: Dict[str, Any],
     email = {
         "subject": subject,
         "body": body,
-        "from": SENDER_EMAIL,
+        "from": sender_email,
         "to": to_email,
     }
 
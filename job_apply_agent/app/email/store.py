@@ -0,0 +1,25 @@
+"""Cache for generated emails, keyed on the inputs that shape them."""
+
+from typing import Any, Dict, Optional
+
+from ..config import EMAIL_CACHE_DIR
+from ..utils.cache_utils import content_hash, read_cached_json, write_cached_json
+from ..utils.json_utils import dumps_canonical
+
+
+def email_cache_key(resume_profile: Dict[str, Any], jd_data: Dict[str, Any], prompt_version: str) -> str:
+    """Stable key over the resume profile, JD and generation prompt version."""
+    return content_hash(dumps_canonical({"r": resume_profile, "j": jd_data, "p": prompt_version}))
+
+
+def load_cached_email(cache_key: str) -> Optional[Dict[str, str]]:
+    """Return the cached generated email (subject, body), or None on a miss."""
+    return read_cached_json(EMAIL_CACHE_DIR / f"{cache_key}.json")
+
+
+def cache_email(cache_key: str, generated: Dict[str, str]) -> None:
+    """Cache a generated email. Best-effort: write errors are ignored."""
+    try:
+        write_cached_json(EMAIL_CACHE_DIR / f"{cache_key}.json", generated)
+    except OSError:
+        pass
@@ -1,45 +1,16 @@
 """Job Description PDF parser using OpenAI."""
 
+import asyncio
 import os
-from typing import Dict, Any
+from typing import Dict, Any, BinaryIO
 
+from ..config import MAX_JD_TEXT_CHARS
+from ..utils.cache_utils import content_hash
 from ..utils.pdf_utils import extract_text_from_pdf
 from ..utils.openai_utils import call_openai_for_json, fill_defaults
 
-
-def parse_jd(pdf_path: str) -> Dict[str, Any]:
-    """Parse job description from PDF and extract structured information.
-    
-    Reads a JD PDF file, extracts text, and uses OpenAI to parse it
-    into structured fields: company, role, key_skills, summary.
-    
-    Args:
-        pdf_path: Path to JD PDF
-        
-    Returns:
-        Dict with keys:
-            - company: Company name (string)
-            - role: Job title/role (string)
-            - key_skills: List of required skills (array)
-            - summary: Brief job summary (string)
-            - email: Contact email if found (string, may be empty)
-            - raw_text: Full text extracted from PDF
-            
-    Raises:
-        ValueError: If PDF not found, cannot be read, or OpenAI call fails
-    """
-    # Check file exists
-    if not os.path.exists(pdf_path):
-        raise ValueError(f"JD file not found: {pdf_path}")
-
-    # Extract text from PDF
-    raw_text = extract_text_from_pdf(pdf_path)
-    
-    if not raw_text or not raw_text.strip():
-        raise ValueError("Job description PDF is empty")
-
-    # Define what we want OpenAI to extract
-    system_prompt = """\
+# Define what we want OpenAI to extract
+JD_PARSER_SYSTEM_PROMPT = """\
 You are a job description parser. Extract structured information from the JD text.
 
 Return ONLY a valid JSON object with these exact fields:
@@ -68,10 +39,64 @@ Rules:
 - Return valid JSON only, no other text
 """
 
+
+def jd_cache_key(pdf_hash: str) -> str:
+    """Cache key for a JD upload: content hash (see cache_utils) plus parser version.
+
+    The version covers the system prompt and the text cap, so changing either
+    invalidates cached parses.
+    """
+    version = content_hash(f"{JD_PARSER_SYSTEM_PROMPT}\0{MAX_JD_TEXT_CHARS}".encode("utf-8"))[:12]
+    return f"{pdf_hash}-{version}"
+
+
+async def parse_jd(pdf_path: str | bytes | BinaryIO) -> Dict[str, Any]:
+    """Parse job description from PDF and extract structured information.
+    
+    Reads a JD PDF file, extracts text, and uses OpenAI to parse it
+    into structured fields: company, role, key_skills, summary.
+
+    The extracted text is capped at MAX_JD_TEXT_CHARS before it is sent to
+    OpenAI or returned. Callers archive the original PDF under
+    storage/jds/raw/<raw_text_sha>.pdf with jd.store.archive_jd_pdf.
+    
+    Args:
+        pdf_path: Path to JD PDF, the PDF contents as bytes, or a seekable
+                  binary file object (e.g. an upload's spooled file)
+        
+    Returns:
+        Dict with keys:
+            - company: Company name (string)
+            - role: Job title/role (string)
+            - key_skills: List of required skills (array)
+            - summary: Brief job summary (string)
+            - email: Contact email if found (string, may be empty)
+            - raw_text: Text extracted from PDF (capped at MAX_JD_TEXT_CHARS)
+            - raw_text_sha: Hash of the full extracted text
+            - raw_text_truncated: True if raw_text was capped
+            
+    Raises:
+        ValueError: If PDF not found, cannot be read, or OpenAI call fails
+    """
+    # Check file exists
+    if isinstance(pdf_path, (str, os.PathLike)) and not os.path.exists(pdf_path):
+        raise ValueError(f"JD file not found: {pdf_path}")
+
+    # Extract text from PDF (CPU-bound; keep it off the event loop)
+    raw_text = await asyncio.to_thread(extract_text_from_pdf, pdf_path)
+    
+    if not raw_text or not raw_text.strip():
+        raise ValueError("Job description PDF is empty")
+
+    # Hash the full text and bound what we carry forward
+    raw_sha = content_hash(raw_text.encode("utf-8"))
+    truncated = len(raw_text) > MAX_JD_TEXT_CHARS
+    raw_text = raw_text[:MAX_JD_TEXT_CHARS]
+
     user_prompt = f"Parse this job description:\n\n{raw_text}"
 
     # Call OpenAI to parse JD
-    parsed = call_openai_for_json(system_prompt, user_prompt, max_tokens=1000)
+    parsed = await call_openai_for_json(JD_PARSER_SYSTEM_PROMPT, user_prompt, max_tokens=1000)
 
     # Ensure all expected fields are present
     defaults = {
@@ -83,7 +108,9 @@ Rules:
     }
     parsed = fill_defaults(parsed, defaults)
 
-    # Include raw text for reference
+    # Include (bounded) raw text for reference
     parsed["raw_text"] = raw_text
+    parsed["raw_text_sha"] = raw_sha
+    parsed["raw_text_truncated"] = truncated
 
     return parsed
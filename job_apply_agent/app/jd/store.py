@@ -1,10 +1,17 @@
-from fastapi import HTTPException
+from fastapi import HTTPException, UploadFile
 from starlette import status
-import json
+import os
+import uuid
 from datetime import datetime
 from pathlib import Path
+from typing import Optional
 
-from ..config import JD_DATA_PATH, JDS_DIR
+import aiofiles
+import aiofiles.os
+
+from ..config import JD_DATA_PATH, JDS_DIR, JD_CACHE_DIR, JD_RAW_DIR, ensure_storage_dirs
+from ..utils.cache_utils import invalidate_json_cache, read_cached_json, write_cached_json
+from ..utils.json_utils import dumps_pretty
 
 
 def _timestamped_jd_path() -> Path:
@@ -20,6 +27,11 @@ def save_jd(jd_data: dict) -> str:
     storage/current_jd.json as the "latest" pointer. This prevents
     state corruption when multiple JDs are submitted back-to-back.
 
+    The JD is serialized once. The pointer is swapped in with os.replace, so
+    concurrent readers never see a partially written current_jd.json. Where
+    the filesystem supports it, the pointer is a hard link to the history
+    copy and no second write is needed.
+
     Args:
         jd_data: Dict with keys: company, role, key_skills, summary, raw_text
 
@@ -30,15 +42,24 @@ def save_jd(jd_data: dict) -> str:
         HTTPException on write failure
     """
     jd_history_path = _timestamped_jd_path()
+    # Unique per save so concurrent submissions never share a temp file
+    tmp_path = JD_DATA_PATH.with_suffix(f".{jd_history_path.stem}.tmp")
 
     try:
+        ensure_storage_dirs()
+        payload = dumps_pretty(jd_data)
+
         # Write immutable, timestamped copy
-        with jd_history_path.open("w", encoding="utf-8") as f:
-            json.dump(jd_data, f, indent=2, ensure_ascii=False)
+        jd_history_path.write_bytes(payload)
 
-        # Refresh the latest pointer
-        with JD_DATA_PATH.open("w", encoding="utf-8") as f:
-            json.dump(jd_data, f, indent=2, ensure_ascii=False)
+        # Refresh the latest pointer atomically
+        try:
+            os.link(jd_history_path, tmp_path)
+        except OSError:
+            # No hard-link support (e.g. some network/Windows filesystems)
+            tmp_path.write_bytes(payload)
+        os.replace(tmp_path, JD_DATA_PATH)
+        invalidate_json_cache(JD_DATA_PATH)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -46,3 +67,59 @@ def save_jd(jd_data: dict) -> str:
         )
 
     return str(jd_history_path)
+
+
+# Copy size when streaming an upload into the archive
+_ARCHIVE_CHUNK_SIZE = 1024 * 1024
+
+
+async def archive_jd_pdf(upload: UploadFile, raw_text_sha: str) -> Path:
+    """Keep the original JD PDF under storage/jds/raw/<raw_text_sha>.pdf (once per JD text).
+
+    Streams the upload in chunks through aiofiles, so multi-MB uploads neither
+    block the event loop nor get copied into memory whole. The copy goes to a
+    temp file swapped in with os.replace, so a failed or concurrent upload
+    never leaves a truncated archive behind.
+
+    Args:
+        upload: Uploaded JD PDF
+        raw_text_sha: raw_text_sha from parse_jd
+
+    Returns:
+        Path to the archived PDF
+    """
+    ensure_storage_dirs()
+    archived_pdf = JD_RAW_DIR / f"{raw_text_sha}.pdf"
+    if not await aiofiles.os.path.exists(archived_pdf):
+        # Unique per upload so concurrent archives of one JD never share a temp file
+        tmp_path = archived_pdf.with_suffix(f".{uuid.uuid4().hex}.tmp")
+        try:
+            await upload.seek(0)
+            async with aiofiles.open(tmp_path, "wb") as f:
+                while chunk := await upload.read(_ARCHIVE_CHUNK_SIZE):
+                    await f.write(chunk)
+            await aiofiles.os.replace(tmp_path, archived_pdf)
+        except BaseException:
+            try:
+                await aiofiles.os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+    return archived_pdf
+
+
+def load_cached_jd(cache_key: str) -> Optional[dict]:
+    """Return the parsed JD cached for an upload, or None on a miss.
+
+    Args:
+        cache_key: Key from jd_cache_key() for the uploaded PDF bytes
+    """
+    return read_cached_json(JD_CACHE_DIR / f"{cache_key}.json")
+
+
+def cache_jd(cache_key: str, jd_data: dict) -> None:
+    """Cache a parsed JD for its upload. Best-effort: write errors are ignored."""
+    try:
+        write_cached_json(JD_CACHE_DIR / f"{cache_key}.json", jd_data)
+    except OSError:
+        pass
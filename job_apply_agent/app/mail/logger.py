@@ -1,11 +1,13 @@
 """Application logging for sent emails."""
 
-import json
+import os
 from datetime import datetime
-from typing import Dict, Any
+from itertools import islice
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 from pathlib import Path
 
-from ..config import APPLICATIONS_LOG_PATH
+from ..config import APPLICATIONS_LOG_PATH, ensure_storage_dirs
+from ..utils.json_utils import dumps_line, loads
 
 
 def log_application(
@@ -15,6 +17,7 @@ def log_application(
     subject: str,
     status: str = "sent",
     notes: str = "",
+    timestamp: Optional[str] = None,
 ) -> Dict[str, Any]:
     """Log a sent application to the applications log.
     
@@ -34,6 +37,8 @@ def log_application(
         subject: Email subject line
         status: Sending status (default: "sent")
         notes: Optional notes or error message
+        timestamp: ISO timestamp to record (default: now); lets callers that
+                   log in the background report it before the write
         
     Returns:
         Dict with log entry details
@@ -42,7 +47,7 @@ def log_application(
         ValueError: If log writing fails
     """
     log_entry = {
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": timestamp or datetime.now().isoformat(),
         "recipient_email": recipient_email,
         "company": company,
         "role": role,
@@ -52,24 +57,10 @@ def log_application(
     }
     
     try:
-        # Read existing logs if file exists
-        logs = []
-        if APPLICATIONS_LOG_PATH.exists():
-            with APPLICATIONS_LOG_PATH.open("r", encoding="utf-8") as f:
-                content = f.read().strip()
-                if content:
-                    # Each line is a JSON log entry
-                    for line in content.split("\n"):
-                        if line.strip():
-                            logs.append(json.loads(line))
-        
-        # Append new entry
-        logs.append(log_entry)
-        
-        # Write updated logs (JSONL format: one JSON object per line)
-        with APPLICATIONS_LOG_PATH.open("w", encoding="utf-8") as f:
-            for log in logs:
-                f.write(json.dumps(log) + "\n")
+        # Append a single line (JSONL format: one JSON object per line)
+        ensure_storage_dirs()
+        with APPLICATIONS_LOG_PATH.open("ab") as f:
+            f.write(dumps_line(log_entry) + b"\n")
         
         return log_entry
     
@@ -77,22 +68,128 @@ def log_application(
         raise ValueError(f"Failed to write application log: {str(e)}")
 
 
-def get_application_history() -> list:
-    """Get all logged applications.
-    
+# Block size used when reading the log backwards for tail queries
+_TAIL_BLOCK_SIZE = 64 * 1024
+
+# Last history result, keyed on (mtime_ns, size, limit, offset, tail) of the log file
+_HISTORY_CACHE: Dict[Tuple[int, int, int | None, int, bool], List[Dict[str, Any]]] = {}
+# Entry count of the log file, keyed on its inode: (mtime_ns, size, terminated non-empty
+# lines, whether the unterminated last line is non-empty), so appends are counted incrementally
+_COUNT_CACHE: Dict[int, Tuple[int, int, int, bool]] = {}
+
+
+def _iter_lines_reversed(path: Path, block_size: int = _TAIL_BLOCK_SIZE) -> Iterator[bytes]:
+    """Yield the lines of a file last-to-first, reading fixed-size blocks from the end."""
+    with path.open("rb") as f:
+        pos = f.seek(0, os.SEEK_END)
+        rest = b""
+        while pos > 0:
+            step = min(block_size, pos)
+            pos -= step
+            f.seek(pos)
+            lines = (f.read(step) + rest).split(b"\n")
+            # First piece may be a partial line; carry it into the next block
+            rest = lines.pop(0)
+            yield from reversed(lines)
+        yield rest
+
+
+def iter_application_history(reverse: bool = False) -> Iterator[Dict[str, Any]]:
+    """Stream logged applications one entry at a time.
+
+    Args:
+        reverse: Yield newest entries first (reads the log from the end)
+
+    Yields:
+        Log entries (dicts)
+    """
+    if not APPLICATIONS_LOG_PATH.exists():
+        return
+
+    if reverse:
+        lines = _iter_lines_reversed(APPLICATIONS_LOG_PATH)
+    else:
+        lines = APPLICATIONS_LOG_PATH.read_bytes().splitlines()
+
+    for line in lines:
+        if line.strip():
+            yield loads(line)
+
+
+def get_application_history(limit: int | None = None, tail: bool = True, offset: int = 0) -> list:
+    """Get logged applications in chronological order.
+
+    Tail queries read the log backwards and stop after limit + offset
+    entries, so a page of recent history costs O(limit), not O(log size).
+    Results are memoized on the log file's (mtime, size), so repeated calls
+    against an unchanged log don't re-parse it.
+
+    Args:
+        limit: Maximum number of entries to return (default: all)
+        tail: Return the most recent entries instead of the oldest
+        offset: Number of entries to skip first (the newest ones when tail=True)
+
     Returns:
         List of log entries (dicts)
     """
-    if not APPLICATIONS_LOG_PATH.exists():
+    try:
+        st = APPLICATIONS_LOG_PATH.stat()
+    except FileNotFoundError:
         return []
-    
-    logs = []
+
+    key = (st.st_mtime_ns, st.st_size, limit, offset, tail)
+    cached = _HISTORY_CACHE.get(key)
+    if cached is not None:
+        return list(cached)
+
     try:
-        with APPLICATIONS_LOG_PATH.open("r", encoding="utf-8") as f:
-            for line in f:
-                if line.strip():
-                    logs.append(json.loads(line))
+        stop = offset + limit if limit is not None else None
+        if tail:
+            logs = list(islice(iter_application_history(reverse=True), offset, stop))
+            logs.reverse()
+        else:
+            logs = list(islice(iter_application_history(), offset, stop))
     except Exception:
         return []
-    
-    return logs
+
+    _HISTORY_CACHE.clear()
+    _HISTORY_CACHE[key] = logs
+    return list(logs)
+
+
+def count_application_history() -> int:
+    """Number of logged applications.
+
+    The log is append-only, so once counted only the bytes appended since the
+    last call are read. A log that shrank, was replaced, or changed without
+    growing is counted again from the start.
+    """
+    try:
+        st = APPLICATIONS_LOG_PATH.stat()
+    except FileNotFoundError:
+        return 0
+
+    cached = _COUNT_CACHE.get(st.st_ino)
+    if cached is not None and (cached[0], cached[1]) == (st.st_mtime_ns, st.st_size):
+        return cached[2] + cached[3]
+    start, count, tail_nonempty = 0, 0, False
+    if cached is not None and cached[1] < st.st_size:
+        start, count, tail_nonempty = cached[1], cached[2], cached[3]
+
+    try:
+        with APPLICATIONS_LOG_PATH.open("rb") as f:
+            f.seek(start)
+            while block := f.read(_TAIL_BLOCK_SIZE):
+                *lines, tail = block.split(b"\n")
+                for line in lines:
+                    count += bool(tail_nonempty or line.strip())
+                    tail_nonempty = False
+                tail_nonempty = tail_nonempty or bool(tail.strip())
+            size = f.tell()
+    except OSError:
+        return 0
+
+    _COUNT_CACHE.clear()
+    # A write racing the read may add bytes past st_size; remember what was actually read
+    _COUNT_CACHE[st.st_ino] = (st.st_mtime_ns if size == st.st_size else -1, size, count, tail_nonempty)
+    return count + tail_nonempty
@@ -1,12 +1,15 @@
 """Email sender module using SMTP."""
 
-import smtplib
+import asyncio
+import logging
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
 from email import encoders
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Set, Tuple
+
+import aiosmtplib
 
 from ..config import (
     SMTP_HOST,
@@ -18,8 +21,141 @@ from ..config import (
     validate_smtp_config,
 )
 
+logger = logging.getLogger(__name__)
+
+# Reconnect attempts (with exponential backoff) when the server drops the connection
+SMTP_MAX_RECONNECTS = 3
+SMTP_RECONNECT_BASE_DELAY = 0.5
+
+
+class _SmtpPool:
+    """One long-lived, logged-in SMTP connection shared by all sends.
+
+    The TLS handshake and AUTH are paid once and reused; the connection is
+    re-established only when it is found closed or the server drops it.
+    """
+
+    def __init__(self) -> None:
+        self._client: Optional[aiosmtplib.SMTP] = None
+        self._lock = asyncio.Lock()
+
+    async def _connect(self) -> aiosmtplib.SMTP:
+        client = aiosmtplib.SMTP(
+            hostname=SMTP_HOST,
+            port=SMTP_PORT,
+            use_tls=False,
+            start_tls=SMTP_USE_TLS,
+            timeout=10,
+        )
+        await client.connect()
+        try:
+            await client.login(SMTP_USER, SMTP_PASSWORD)
+        except BaseException:
+            client.close()  # don't leave the connected socket behind
+            raise
+        self._client = client
+        return client
+
+    async def get_client(self) -> aiosmtplib.SMTP:
+        """Return the shared client, connecting and logging in if needed. Caller holds the lock."""
+        if self._client is not None and self._client.is_connected:
+            return self._client
+        return await self._connect()
+
+    async def connect(self) -> None:
+        """Open and log in the shared connection ahead of the first send."""
+        async with self._lock:
+            await self.get_client()
+
+    async def send_message(self, message: MIMEMultipart) -> None:
+        async with self._lock:
+            delay = SMTP_RECONNECT_BASE_DELAY
+            for attempt in range(SMTP_MAX_RECONNECTS + 1):
+                try:
+                    client = await self.get_client()
+                    await client.send_message(message)
+                    return
+                except aiosmtplib.SMTPServerDisconnected:
+                    self._client = None
+                    if attempt == SMTP_MAX_RECONNECTS:
+                        raise
+                    await asyncio.sleep(delay)
+                    delay *= 2
+
+    async def close(self) -> None:
+        async with self._lock:
+            client, self._client = self._client, None
+            if client is None or not client.is_connected:
+                return
+            try:
+                await client.quit()
+            except aiosmtplib.SMTPException:
+                client.close()
+
+
+_pool = _SmtpPool()
+
+# Base64 payload of the resume attachment, keyed on the file's (st_mtime_ns, st_size)
+_attachment_cache: Optional[Tuple[Tuple[int, int], str]] = None
+
+
+def _resume_attachment() -> MIMEBase:
+    """Build the resume MIME part, base64-encoding the PDF only when it has changed."""
+    global _attachment_cache
+
+    st = RESUME_PATH.stat()
+    key = (st.st_mtime_ns, st.st_size)
 
-def send_email(
+    part = MIMEBase("application", "octet-stream")
+    if _attachment_cache is not None and _attachment_cache[0] == key:
+        part.set_payload(_attachment_cache[1])
+        part["Content-Transfer-Encoding"] = "base64"
+    else:
+        part.set_payload(RESUME_PATH.read_bytes())
+        encoders.encode_base64(part)
+        _attachment_cache = (key, part.get_payload())
+
+    part.add_header(
+        "Content-Disposition",
+        f"attachment; filename= {RESUME_PATH.name}",
+    )
+    return part
+
+
+async def connect_smtp_pool() -> None:
+    """Warm the shared SMTP connection (called on app startup).
+
+    Does nothing when SMTP isn't configured. Connection failures are reported
+    but not raised; the next send retries the connection.
+    """
+    try:
+        validate_smtp_config()
+    except ValueError:
+        return
+    try:
+        await _pool.connect()
+    except Exception as e:
+        logger.warning("SMTP warm-up failed: %s", e)
+
+
+# Strong references so in-flight warm-ups aren't garbage collected
+_warmup_tasks: Set[asyncio.Task] = set()
+
+
+def start_smtp_warmup() -> asyncio.Task:
+    """Connect the shared SMTP client in the background, e.g. while an email is composed."""
+    task = asyncio.create_task(connect_smtp_pool())
+    _warmup_tasks.add(task)
+    task.add_done_callback(_warmup_tasks.discard)
+    return task
+
+
+async def close_smtp_pool() -> None:
+    """Close the shared SMTP connection (called on app shutdown)."""
+    await _pool.close()
+
+
+async def send_email(
     recipient_email: str,
     subject: str,
     body: str,
@@ -71,25 +207,12 @@ def send_email(
         # Attach resume if requested and exists
         if attach_resume and RESUME_PATH.exists():
             try:
-                with open(RESUME_PATH, "rb") as attachment:
-                    part = MIMEBase("application", "octet-stream")
-                    part.set_payload(attachment.read())
-                    encoders.encode_base64(part)
-                    part.add_header(
-                        "Content-Disposition",
-                        f"attachment; filename= {RESUME_PATH.name}",
-                    )
-                    message.attach(part)
+                message.attach(_resume_attachment())
             except Exception as e:
                 raise ValueError(f"Failed to attach resume: {str(e)}")
         
-        # Send email via SMTP
-        with smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=10) as server:
-            if SMTP_USE_TLS:
-                server.starttls()
-            
-            server.login(SMTP_USER, SMTP_PASSWORD)
-            server.send_message(message)
+        # Send email over the shared SMTP connection
+        await _pool.send_message(message)
         
         return {
             "status": "sent",
@@ -98,9 +221,9 @@ def send_email(
             "subject": subject,
         }
     
-    except smtplib.SMTPAuthenticationError as e:
+    except aiosmtplib.SMTPAuthenticationError as e:
         raise ValueError(f"SMTP authentication failed: {str(e)}")
-    except smtplib.SMTPException as e:
+    except aiosmtplib.SMTPException as e:
         raise ValueError(f"SMTP error: {str(e)}")
     except Exception as e:
         raise ValueError(f"Failed to send email: {str(e)}")
@@ -1,9 +1,76 @@
+import logging
+import queue
+from contextlib import asynccontextmanager
+from logging.handlers import QueueHandler, QueueListener
+from typing import Tuple
+
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 
+from .config import LOG_LEVEL
 from .routes.resume import router as resume_router
 from .routes.apply import router as apply_router
+from .mail.sender import connect_smtp_pool, close_smtp_pool
+from .email.generator import load_resume_profile
+from .utils.openai_utils import close_http_session
+
+
+def _start_log_listener() -> Tuple[QueueListener, QueueHandler]:
+    """Send the app's log records through a queue, so stream writes happen on a listener thread.
+
+    The app logger's level is JAA_LOG_LEVEL. Undo with _stop_log_listener, so
+    a second startup in the same process does not add a second handler.
+    """
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    app_logger = logging.getLogger(__package__)
+    for stale in [h for h in app_logger.handlers if isinstance(h, QueueHandler)]:
+        app_logger.removeHandler(stale)  # left by a startup that never shut down
+    app_logger.addHandler(queue_handler)
+    app_logger.setLevel(LOG_LEVEL)
+    app_logger.propagate = False
+
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    listener = QueueListener(log_queue, handler)
+    listener.start()
+    return listener, queue_handler
+
+
+def _stop_log_listener(listener: QueueListener, queue_handler: QueueHandler) -> None:
+    app_logger = logging.getLogger(__package__)
+    app_logger.removeHandler(queue_handler)
+    app_logger.propagate = True
+    listener.stop()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    log_listener, queue_handler = _start_log_listener()
+    try:
+        # Pay SMTP TLS + AUTH and the profile read once at startup, not on the first request
+        await connect_smtp_pool()
+        try:
+            load_resume_profile()  # fills the in-process profile cache
+        except (FileNotFoundError, ValueError):
+            pass  # no resume uploaded yet
+        try:
+            yield
+        finally:
+            # Each close runs even if the one before it raised
+            try:
+                await close_smtp_pool()
+            finally:
+                await close_http_session()
+    finally:
+        _stop_log_listener(log_listener, queue_handler)
+
 
-app = FastAPI(title="Job Apply Agent")
+app = FastAPI(
+    title="Job Apply Agent",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 
 # Phase 1 & 2: Resume upload + automatic parsing
 app.include_router(resume_router)
@@ -1,23 +1,130 @@
 """Resume PDF parser using OpenAI."""
 
+import asyncio
 import os
 import re
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
 
-from ..config import RESUME_PATH
+from ..config import RESUME_PATH, RESUME_CACHE_DIR
+from ..utils.cache_utils import content_hash, file_hash, read_cached_json, write_cached_json
 from ..utils.pdf_utils import extract_text_from_pdf
 from ..utils.openai_utils import call_openai_for_json, fill_defaults
 
+# Define what we want OpenAI to extract
+RESUME_PARSER_SYSTEM_PROMPT = """\
+You are a resume parser. Extract structured information from the resume text.
 
-def parse_resume(pdf_path: str = None) -> Dict[str, Any]:
+Return ONLY a valid JSON object with these exact fields:
+{
+    "name": "full name (string or empty)",
+    "current_title": "current job title (string or empty)",
+    "summary": "brief professional summary (string or empty)",
+    "skills": ["skill1", "skill2", ...] (array of strings),
+    "experience": ["job1 at company1", "job2 at company2", ...] (array),
+    "projects": ["project1 description", "project2 description", ...] (array),
+    "earliest_experience_start_year": "YYYY or empty string",
+    "total_experience_years": "integer number of years or 0"
+}
+
+Rules:
+- Extract ONLY information explicitly in the resume
+- Do NOT invent or hallucinate skills, experience, or projects
+- Use empty string "" for missing name/title/summary
+- Use empty array [] for missing skills/experience/projects
+- For earliest_experience_start_year, return "" if no dates are present
+- For total_experience_years, return 0 if dates are not present or cannot be inferred
+- Return valid JSON only, no other text
+"""
+
+RESUME_PARSER_USER_PROMPT = "Parse this resume:\n\n{resume_text}"
+
+_YEAR_RE = re.compile(r"\b(?:19|20)\d{2}\b")
+# Experience headings in priority order: "work experience" wins wherever it appears
+_EXP_HEADING_RES = (
+    re.compile(r"work experience", re.IGNORECASE),
+    re.compile(r"experience", re.IGNORECASE),
+)
+_EDU_HEADING_RE = re.compile(r"education", re.IGNORECASE)
+
+# Section headings (a line on its own) mapped to a canonical section name
+_SECTION_ALIASES = {
+    "summary": ("summary", "professional summary", "profile", "about me", "objective"),
+    "experience": (
+        "experience", "work experience", "professional experience",
+        "employment history", "work history",
+    ),
+    "skills": ("skills", "technical skills", "core skills", "technologies"),
+    "projects": ("projects", "personal projects", "selected projects", "key projects"),
+    "education": ("education", "academic background"),
+    "certifications": ("certifications", "certificates", "licenses"),
+    "awards": ("awards", "achievements", "honors"),
+    "publications": ("publications",),
+    "interests": ("interests", "hobbies"),
+    "references": ("references",),
+}
+_SECTION_BY_HEADING = {alias: name for name, aliases in _SECTION_ALIASES.items() for alias in aliases}
+_SECTION_HEADING_RE = re.compile(
+    r"^[ \t]*("
+    + "|".join(re.escape(h) for h in sorted(_SECTION_BY_HEADING, key=len, reverse=True))
+    + r")[ \t]*:?[ \t]*$",
+    re.IGNORECASE | re.MULTILINE,
+)
+# Sections the parser needs; "header" is the text above the first heading (name, title, contact)
+_PROMPT_SECTIONS = frozenset({"header", "summary", "experience", "skills", "projects"})
+# Bump when _split_sections/_prompt_text change what text reaches the model
+_SECTIONING_VERSION = "sections-v1"
+
+# Part of the cache key, so editing the prompts or the sectioning invalidates cached parses
+_PROMPT_VERSION = content_hash("\n".join([
+    RESUME_PARSER_SYSTEM_PROMPT,
+    RESUME_PARSER_USER_PROMPT,
+    _SECTIONING_VERSION,
+    repr(sorted(_SECTION_BY_HEADING.items())),
+    repr(sorted(_PROMPT_SECTIONS)),
+]).encode("utf-8"))[:12]
+
+
+def _split_sections(raw_text: str) -> List[Tuple[str, str]]:
+    """Split resume text on heading lines into (section, text) pairs in document order.
+
+    Each text keeps its heading line. Returns an empty list if no headings are found.
+    """
+    matches = list(_SECTION_HEADING_RE.finditer(raw_text))
+    if not matches:
+        return []
+    sections = [("header", raw_text[: matches[0].start()])]
+    for match, nxt in zip(matches, matches[1:] + [None]):
+        name = _SECTION_BY_HEADING[match.group(1).lower()]
+        sections.append((name, raw_text[match.start(): nxt.start() if nxt else None]))
+    return sections
+
+
+def _prompt_text(raw_text: str) -> str:
+    """Resume text for the LLM: only the sections it extracts fields from.
+
+    Education, references and similar sections are dropped to save input tokens.
+    Falls back to the full text when the resume has no recognizable headings.
+    """
+    kept = [text.strip() for name, text in _split_sections(raw_text) if name in _PROMPT_SECTIONS]
+    kept = [text for text in kept if text]
+    return "\n\n".join(kept) if kept else raw_text
+
+
+async def parse_resume(pdf_path: str = None, pdf_hash: str = None) -> Dict[str, Any]:
     """Parse resume from PDF and extract structured information.
     
     Reads a PDF resume file, extracts text, and uses OpenAI to parse it
     into structured fields: name, current_title, summary, skills, experience, projects.
+
+    Results are cached under storage/resume_cache/ by PDF content hash and
+    prompt version, so re-parsing an unchanged resume skips both text
+    extraction and the OpenAI call.
     
     Args:
         pdf_path: Path to resume PDF (defaults to stored resume path)
+        pdf_hash: Content hash of the PDF if already known (e.g. from save_resume);
+                  computed from the file otherwise
         
     Returns:
         Dict with keys:
@@ -28,6 +135,7 @@ def parse_resume(pdf_path: str = None) -> Dict[str, Any]:
             - experience: List of past roles (array)
             - projects: List of projects (array)
             - raw_text: Full text extracted from PDF
+            - content_hash: Content hash of the PDF
             
     Raises:
         ValueError: If PDF not found, cannot be read, or OpenAI call fails
@@ -39,42 +147,23 @@ def parse_resume(pdf_path: str = None) -> Dict[str, Any]:
     if not os.path.exists(target_path):
         raise ValueError(f"Resume file not found: {target_path}")
 
-    # Extract text from PDF
-    raw_text = extract_text_from_pdf(target_path)
+    pdf_hash = pdf_hash or file_hash(target_path)
+    cache_path = RESUME_CACHE_DIR / f"{pdf_hash}-{_PROMPT_VERSION}.json"
+    cached = read_cached_json(cache_path)
+    if cached is not None:
+        cached["content_hash"] = pdf_hash
+        return _with_experience_years(cached, cached.get("raw_text", ""))
+
+    # Extract text from PDF (CPU-bound; keep it off the event loop)
+    raw_text = await asyncio.to_thread(extract_text_from_pdf, target_path)
     
     if not raw_text or not raw_text.strip():
         raise ValueError("Resume PDF is empty")
 
-    # Define what we want OpenAI to extract
-    system_prompt = """\
-You are a resume parser. Extract structured information from the resume text.
-
-Return ONLY a valid JSON object with these exact fields:
-{
-    "name": "full name (string or empty)",
-    "current_title": "current job title (string or empty)",
-    "summary": "brief professional summary (string or empty)",
-    "skills": ["skill1", "skill2", ...] (array of strings),
-    "experience": ["job1 at company1", "job2 at company2", ...] (array),
-    "projects": ["project1 description", "project2 description", ...] (array),
-    "earliest_experience_start_year": "YYYY or empty string",
-    "total_experience_years": "integer number of years or 0"
-}
-
-Rules:
-- Extract ONLY information explicitly in the resume
-- Do NOT invent or hallucinate skills, experience, or projects
-- Use empty string "" for missing name/title/summary
-- Use empty array [] for missing skills/experience/projects
-- For earliest_experience_start_year, return "" if no dates are present
-- For total_experience_years, return 0 if dates are not present or cannot be inferred
-- Return valid JSON only, no other text
-"""
-
-    user_prompt = f"Parse this resume:\n\n{raw_text}"
+    user_prompt = RESUME_PARSER_USER_PROMPT.format(resume_text=_prompt_text(raw_text))
 
     # Call OpenAI to parse resume
-    parsed = call_openai_for_json(system_prompt, user_prompt, max_tokens=1500)
+    parsed = await call_openai_for_json(RESUME_PARSER_SYSTEM_PROMPT, user_prompt, max_tokens=1500)
 
     # Ensure all expected fields are present
     defaults = {
@@ -89,25 +178,37 @@ Rules:
     }
     parsed = fill_defaults(parsed, defaults)
 
-    # Post-compute experience duration; prioritize years in the Experience section over Education
+    # Include raw text for reference
+    parsed["raw_text"] = raw_text
+    parsed["content_hash"] = pdf_hash
+
+    # Cache the model output; experience years are recomputed on every read
     try:
-        text_lower = raw_text.lower()
+        write_cached_json(cache_path, parsed)
+    except OSError:
+        pass  # caching is best-effort
+
+    return _with_experience_years(parsed, raw_text)
+
 
+def _with_experience_years(parsed: Dict[str, Any], raw_text: str) -> Dict[str, Any]:
+    """Post-compute experience duration; prioritize years in the Experience section over Education."""
+    try:
         def extract_years(blob: str):
-            return [int(y) for y in re.findall(r"\b(?:19|20)\d{2}\b", blob)]
+            return [int(y) for y in _YEAR_RE.findall(blob)]
 
         # Try to isolate experience block between "experience" and "education" headings
         exp_start = None
-        for marker in ["work experience", "experience"]:
-            idx = text_lower.find(marker)
-            if idx != -1:
-                exp_start = idx
+        for heading_re in _EXP_HEADING_RES:
+            match = heading_re.search(raw_text)
+            if match:
+                exp_start = match.start()
                 break
 
-        edu_idx = text_lower.find("education")
+        edu_match = _EDU_HEADING_RE.search(raw_text)
 
         if exp_start is not None:
-            exp_block = raw_text[exp_start: edu_idx if edu_idx != -1 else None]
+            exp_block = raw_text[exp_start: edu_match.start() if edu_match else None]
             years = extract_years(exp_block)
         else:
             years = extract_years(raw_text)
@@ -122,7 +223,4 @@ Rules:
         # If anything fails, keep the LLM values / defaults
         pass
 
-    # Include raw text for reference
-    parsed["raw_text"] = raw_text
-
     return parsed
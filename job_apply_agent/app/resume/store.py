@@ -2,14 +2,23 @@
 
 from fastapi import UploadFile, HTTPException
 from starlette import status
-import json
+import asyncio
 from pathlib import Path
+from typing import Tuple
 
-from ..config import RESUME_PATH, MAX_RESUME_SIZE_BYTES, MAX_RESUME_SIZE_MB, STORAGE_DIR
-from ..utils.pdf_utils import validate_pdf_header
+import aiofiles
 
+from ..config import RESUME_PATH, MAX_RESUME_SIZE_BYTES, MAX_RESUME_SIZE_MB, STORAGE_DIR, RESUME_RAW_PATH, ensure_storage_dirs
+from ..utils.cache_utils import invalidate_json_cache, new_hasher
+from ..utils.json_utils import dumps_pretty
+from ..utils.pdf_utils import has_pdf_suffix, validate_pdf_header
 
-async def save_resume(file: UploadFile) -> str:
+# Upload read size; large chunks keep the number of loop iterations/awaits low
+_CHUNK_SIZE = 4 * 1024 * 1024
+_TOO_LARGE_DETAIL = f"Resume too large. Max {MAX_RESUME_SIZE_MB}MB."
+
+
+async def save_resume(file: UploadFile) -> Tuple[str, str]:
     """Validate and store the uploaded resume PDF.
     
     Performs these checks:
@@ -18,61 +27,59 @@ async def save_resume(file: UploadFile) -> str:
     - File is not empty
     - File does not exceed size limit (default 10MB)
     
-    Overwrites any existing resume.pdf.
+    Overwrites any existing resume.pdf. The content hash is computed while
+    the chunks are written, so callers never need to re-read the file.
     
     Args:
         file: Uploaded PDF file
         
     Returns:
-        Path to saved resume file
+        Tuple of (path to saved resume file, content hash of the PDF)
         
     Raises:
         HTTPException: If validation fails or storage error occurs
     """
-    filename = (file.filename or "").lower().strip()
-
-    if not filename.endswith(".pdf"):
+    if not has_pdf_suffix(file.filename):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid file type. Only .pdf is allowed.",
         )
 
-    # Content-Type is advisory; we'll validate PDF header instead
+    # Content-Type is advisory; we'll validate PDF header instead.
+    # Check the first chunk before opening RESUME_PATH, so an invalid or
+    # empty upload never truncates the stored resume.
+    chunk = await file.read(_CHUNK_SIZE)
+    if not chunk:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Empty file.",
+        )
+    if not validate_pdf_header(chunk):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid PDF header.",
+        )
+
     total_bytes = 0
-    header_checked = False
+    max_bytes = MAX_RESUME_SIZE_BYTES
+    hasher = new_hasher()
 
     try:
-        with RESUME_PATH.open("wb") as buffer:
-            while True:
-                chunk = await file.read(1024 * 1024)  # Read in 1MB chunks
-                if not chunk:
-                    break
-                    
+        ensure_storage_dirs()
+        async with aiofiles.open(RESUME_PATH, "wb") as buffer:
+            while chunk:
                 total_bytes += len(chunk)
                 
                 # Check size limit
-                if total_bytes > MAX_RESUME_SIZE_BYTES:
+                if total_bytes > max_bytes:
                     raise HTTPException(
                         status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-                        detail=f"Resume too large. Max {MAX_RESUME_SIZE_MB}MB.",
+                        detail=_TOO_LARGE_DETAIL,
                     )
                 
-                # Check PDF header on first chunk
-                if not header_checked:
-                    if not validate_pdf_header(chunk):
-                        raise HTTPException(
-                            status_code=status.HTTP_400_BAD_REQUEST,
-                            detail="Invalid PDF header.",
-                        )
-                    header_checked = True
-                
-                buffer.write(chunk)
-
-        if total_bytes == 0:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Empty file.",
-            )
+                await buffer.write(chunk)
+                hasher.update(chunk)
+                chunk = await file.read(_CHUNK_SIZE)
 
     except HTTPException:
         # Re-raise controlled errors
@@ -95,14 +102,28 @@ async def save_resume(file: UploadFile) -> str:
             detail="Failed to store resume.",
         )
 
-    return str(RESUME_PATH)
+    return str(RESUME_PATH), hasher.hexdigest()
+
+
+def _write_profile(profile_path: Path, profile_data: dict) -> None:
+    # raw_text is large and rarely needed; keep it out of the JSON every request loads
+    ensure_storage_dirs()
+    profile = dict(profile_data)
+    raw_text = profile.pop("raw_text", None)
+    if raw_text is not None:
+        RESUME_RAW_PATH.write_bytes(raw_text.encode("utf-8"))
+    profile_path.write_bytes(dumps_pretty(profile))
+    invalidate_json_cache(profile_path)
 
 
-def save_profile(profile_data: dict) -> str:
+async def save_profile(profile_data: dict) -> str:
     """Save parsed resume profile to JSON file.
     
     Persists the parsed resume data (name, title, skills, experience, projects)
-    to storage/resume_profile.json for later use in email generation.
+    to storage/resume_profile.json for later use in email generation. The
+    extracted text (raw_text) goes to storage/resume_raw.txt instead; load it
+    with load_resume_raw().
+    Serialization and the write run in a worker thread, off the event loop.
 
     Args:
         profile_data: Dict containing parsed resume fields
@@ -116,8 +137,7 @@ def save_profile(profile_data: dict) -> str:
     profile_path = STORAGE_DIR / "resume_profile.json"
 
     try:
-        with profile_path.open("w", encoding="utf-8") as f:
-            json.dump(profile_data, f, indent=2, ensure_ascii=False)
+        await asyncio.to_thread(_write_profile, profile_path, profile_data)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
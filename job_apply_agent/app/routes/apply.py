@@ -1,18 +1,23 @@
 """Job application routes."""
 
-from fastapi import APIRouter, UploadFile, File, HTTPException, Query, Body
+import asyncio
+import logging
+from datetime import datetime
+
+from fastapi import APIRouter, BackgroundTasks, UploadFile, File, HTTPException, Query, Body
 from starlette import status
-import tempfile
-from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 from pydantic import BaseModel
 
-from ..jd.parser import parse_jd
-from ..jd.store import save_jd
+from ..jd.parser import parse_jd, jd_cache_key
+from ..jd.store import save_jd, load_cached_jd, cache_jd, archive_jd_pdf
 from ..email.generator import compose_full_email, load_resume_profile, load_jd_data
-from ..utils.pdf_utils import validate_pdf_header
-from ..mail.sender import send_email
+from ..utils.cache_utils import new_hasher
+from ..utils.pdf_utils import has_pdf_suffix, validate_pdf_header
+from ..mail.sender import send_email, start_smtp_warmup
 from ..mail.logger import log_application
+from ..resume.parser import parse_resume
+from ..resume.store import save_resume, save_profile
 from ..config import SENDER_EMAIL
 
 
@@ -28,17 +33,106 @@ class PreparedEmailPayload(BaseModel):
     body: Optional[str] = None
     sender: Optional[str] = None
     decision: Optional[dict] = None
+    # Used for the application log; read from the stored JD when omitted
+    company: Optional[str] = None
+    role: Optional[str] = None
 from ..v2.agents import analyze_jd, analyze_resume, decide
+from ..v2.store import decision_key, load_decision, save_decision
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# Read size when hashing JD uploads
+_UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+async def _parse_uploaded_jd(jd_file: UploadFile) -> dict:
+    """Validate an uploaded JD PDF and parse it, reusing the cached parse for identical uploads.
+
+    Raises:
+        HTTPException: If the PDF header is invalid
+        ValueError: If parsing fails
+    """
+    # Validate PDF header
+    header = await jd_file.read(4)
+    if not validate_pdf_header(header):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid PDF header.",
+        )
+
+    # Hash the upload in chunks; it stays in Starlette's spooled file (RAM for small PDFs)
+    hasher = new_hasher()
+    hasher.update(header)
+    while chunk := await jd_file.read(_UPLOAD_CHUNK_SIZE):
+        hasher.update(chunk)
+
+    cache_key = jd_cache_key(hasher.hexdigest())
+    jd_data = load_cached_jd(cache_key)
+    if jd_data is not None:
+        return jd_data
 
+    # Parse JD with OpenAI straight from the spooled upload, then keep the original
+    await jd_file.seek(0)
+    jd_data = await parse_jd(jd_file.file)
+    await archive_jd_pdf(jd_file, jd_data["raw_text_sha"])
 
-@router.post("/apply", status_code=status.HTTP_200_OK)
-async def apply_to_job(jd_file: UploadFile = File(...)):
+    cache_jd(cache_key, jd_data)
+    return jd_data
+
+
+async def _run_decision_agents(
+    jd_data: dict,
+    resume_profile: dict,
+    on_decision: Optional[Callable[[str], None]] = None,
+) -> dict:
+    """Return decision info for a JD and resume, reusing storage/decision.json.
+
+    On a miss, the JD and resume analyses run in parallel, then the decision
+    agent; the result is stored for the next caller. on_decision is passed
+    to decide() (it is not called for a stored decision).
+    """
+    key = decision_key(jd_data, resume_profile)
+    decision_info = load_decision(key)
+    if decision_info is not None:
+        return decision_info
+
+    jd_profile, resume_intelligence = await asyncio.gather(
+        analyze_jd(jd_data),
+        analyze_resume(resume_profile),
+    )
+    decision = await decide(jd_profile, resume_intelligence, on_decision=on_decision)
+    decision_info = {
+        "decision": decision.decision,
+        "reasons": decision.reasons,
+        "blockers": decision.blockers,
+        "confidence": decision.confidence,
+    }
+    save_decision(key, decision_info)
+    return decision_info
+
+
+async def _decide_in_background(jd_data: dict) -> None:
+    """Background task for /apply: precompute the decision for the stored resume."""
+    try:
+        resume_profile = await asyncio.to_thread(load_resume_profile)
+        if resume_profile:
+            await _run_decision_agents(jd_data, resume_profile)
+    except Exception as e:
+        # Nothing is waiting on this; later endpoints recompute on a miss
+        logger.warning("Decision agent error: %s", e)
+
+
+@router.post("/apply", status_code=status.HTTP_202_ACCEPTED)
+async def apply_to_job(background_tasks: BackgroundTasks, jd_file: UploadFile = File(...)):
     """Submit a job description and prepare application.
     
     Accepts a job description PDF, parses it to extract company, role, and
     required skills, then saves it for email generation.
+
+    The V2 decision agents run as a background task after the response is
+    sent; their result lands in storage/decision.json, where
+    /prepare-application and /send-email pick it up.
     
     Input: multipart/form-data with field 'jd_file' (PDF)
     Output: Parsed JD saved to storage/current_jd.json
@@ -47,7 +141,7 @@ async def apply_to_job(jd_file: UploadFile = File(...)):
         jd_file: Job description PDF file
         
     Returns:
-        JSON with parsed JD fields: company, role, key_skills, summary
+        202 with parsed JD fields: company, role, key_skills, summary
         
     Raises:
         400: Invalid file type, invalid PDF, or parsing error
@@ -59,77 +153,32 @@ async def apply_to_job(jd_file: UploadFile = File(...)):
             detail="Missing jd_file.",
         )
 
-    filename = (jd_file.filename or "").lower().strip()
-    if not filename.endswith(".pdf"):
+    if not has_pdf_suffix(jd_file.filename):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid file type. Only .pdf is allowed.",
         )
 
-    # Save JD to temporary location for parsing
     try:
-        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
-            content = await jd_file.read()
-            tmp.write(content)
-            tmp_path = tmp.name
-
-        # Validate PDF header
-        with open(tmp_path, "rb") as f:
-            header = f.read(4)
-            if not validate_pdf_header(header):
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Invalid PDF header.",
-                )
-
-        # Parse JD with OpenAI
-        jd_data = parse_jd(tmp_path)
+        # Parse JD with OpenAI (or reuse the parse of an identical upload)
+        jd_data = await _parse_uploaded_jd(jd_file)
 
         # Save JD data to persistent storage
-        jd_path = save_jd(jd_data)
-
-        # Clean up temp file
-        Path(tmp_path).unlink()
+        jd_path = await asyncio.to_thread(save_jd, jd_data)
 
-        # Run V2 decision agents
-        decision_info = None
-        try:
-            # Analyze JD using V2 agent
-            jd_profile = analyze_jd(jd_data)
-            
-            # Load resume profile and analyze it
-            resume_profile = load_resume_profile()
-            if resume_profile:
-                resume_intelligence = analyze_resume(resume_profile)
-                
-                # Get decision from decision agent
-                decision = decide(jd_profile, resume_intelligence)
-                decision_info = {
-                    "decision": decision.decision,
-                    "reasons": decision.reasons,
-                    "blockers": decision.blockers,
-                    "confidence": decision.confidence,
-                }
-        except Exception as e:
-            # Log decision error but don't block apply endpoint
-            print(f"Decision agent error: {str(e)}")
-            decision_info = None
+        # Run V2 decision agents once the response is out
+        background_tasks.add_task(_decide_in_background, jd_data)
 
-        # Return parsed JD with decision info (exclude raw_text from response)
-        response = {
+        # Return parsed JD (exclude raw_text from response)
+        return {
             "status": "parsed",
             "jd_path": jd_path,
             "company": jd_data.get("company", ""),
             "role": jd_data.get("role", ""),
             "key_skills": jd_data.get("key_skills", []),
             "summary": jd_data.get("summary", ""),
+            "decision_status": "pending",
         }
-        
-        # Add decision info if available
-        if decision_info:
-            response["decision"] = decision_info
-        
-        return response
 
     except HTTPException:
         # Re-raise HTTP exceptions
@@ -146,6 +195,80 @@ async def apply_to_job(jd_file: UploadFile = File(...)):
         )
 
 
+@router.post("/prepare", status_code=status.HTTP_200_OK)
+async def prepare(
+    resume_file: UploadFile = File(...),
+    jd_file: UploadFile = File(...),
+):
+    """Upload a resume and a JD together and parse both concurrently.
+
+    Equivalent to POST /resume followed by POST /apply (without the decision
+    agents), but the two OpenAI parsing calls overlap instead of running
+    back to back.
+
+    Input: multipart/form-data with fields 'resume_file' and 'jd_file' (PDFs)
+
+    Returns:
+        Parsed resume and JD fields (raw_text excluded)
+
+    Raises:
+        400: Invalid file type, invalid PDF, or parsing error
+        500: Storage or API failure
+    """
+    if not has_pdf_suffix(jd_file.filename):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid file type. Only .pdf is allowed.",
+        )
+
+    async def ingest_resume():
+        resume_path, resume_hash = await save_resume(resume_file)
+        profile = await parse_resume(pdf_hash=resume_hash)
+        profile_path = await save_profile(profile)
+        return resume_path, profile_path, profile
+
+    try:
+        (resume_path, profile_path, profile), jd_data = await asyncio.gather(
+            ingest_resume(),
+            _parse_uploaded_jd(jd_file),
+        )
+        jd_path = await asyncio.to_thread(save_jd, jd_data)
+
+        return {
+            "status": "prepared",
+            "resume": {
+                "resume_path": resume_path,
+                "profile_path": profile_path,
+                "name": profile.get("name", ""),
+                "current_title": profile.get("current_title", ""),
+                "summary": profile.get("summary", ""),
+                "skills": profile.get("skills", []),
+                "experience": profile.get("experience", []),
+                "projects": profile.get("projects", []),
+            },
+            "jd": {
+                "jd_path": jd_path,
+                "company": jd_data.get("company", ""),
+                "role": jd_data.get("role", ""),
+                "key_skills": jd_data.get("key_skills", []),
+                "summary": jd_data.get("summary", ""),
+            },
+        }
+
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Failed to prepare: {str(e)}",
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to prepare: {str(e)}",
+        )
+
+
 @router.post("/prepare-application", status_code=status.HTTP_200_OK)
 async def prepare_application(
     jd_file: UploadFile = File(...),
@@ -156,7 +279,8 @@ async def prepare_application(
 
     Flow:
     1) Parse JD (V1) and persist.
-    2) Analyze JD + Resume (V2 agents) → decision.
+    2) Analyze JD + Resume (V2 agents) → decision (reused from storage/decision.json
+       when /apply already computed it for this JD and resume).
     3) Generate email (V1) using JD/resume and optional email override.
     4) Return decision + email preview + can_send flag (SKIP blocks unless force).
 
@@ -175,38 +299,19 @@ async def prepare_application(
             detail="Missing jd_file.",
         )
 
-    filename = (jd_file.filename or "").lower().strip()
-    if not filename.endswith(".pdf"):
+    if not has_pdf_suffix(jd_file.filename):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid file type. Only .pdf is allowed.",
         )
 
     try:
-        # Save JD to temp
-        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
-            content = await jd_file.read()
-            tmp.write(content)
-            tmp_path = tmp.name
-
-        # Validate PDF header
-        with open(tmp_path, "rb") as f:
-            header = f.read(4)
-            if not validate_pdf_header(header):
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Invalid PDF header.",
-                )
-
         # Parse JD (V1) and persist
-        jd_data = parse_jd(tmp_path)
-        jd_path = save_jd(jd_data)
-
-        # Clean temp
-        Path(tmp_path).unlink()
+        jd_data = await _parse_uploaded_jd(jd_file)
+        jd_path = await asyncio.to_thread(save_jd, jd_data)
 
         # Ensure resume is available
-        resume_profile = load_resume_profile()
+        resume_profile = await asyncio.to_thread(load_resume_profile)
         if not resume_profile:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -217,23 +322,15 @@ async def prepare_application(
         decision_info = None
         decision_code = None
         try:
-            jd_profile = analyze_jd(jd_data)
-            resume_intelligence = analyze_resume(resume_profile)
-            decision = decide(jd_profile, resume_intelligence)
-            decision_code = decision.decision
-            decision_info = {
-                "decision": decision.decision,
-                "reasons": decision.reasons,
-                "blockers": decision.blockers,
-                "confidence": decision.confidence,
-            }
+            decision_info = await _run_decision_agents(jd_data, resume_profile)
+            decision_code = decision_info["decision"]
         except Exception as e:
             # Graceful degradation: allow flow to continue
-            print(f"Decision agent error: {str(e)}")
+            logger.warning("Decision agent error: %s", e)
             decision_info = None
 
         # Compose email preview (V1)
-        email_obj = compose_full_email(resume_profile, jd_data, recipient_email=email)
+        email_obj = await compose_full_email(resume_profile, jd_data, recipient_email=email)
 
         # Determine if send should be allowed
         can_send = True
@@ -304,12 +401,14 @@ async def generate_email_endpoint(email: str = Query(None)):
         500: Email generation failure
     """
     try:
-        # Load stored data
-        resume_profile = load_resume_profile()
-        jd_data = load_jd_data()
+        # Load stored data (both reads in parallel)
+        resume_profile, jd_data = await asyncio.gather(
+            asyncio.to_thread(load_resume_profile),
+            asyncio.to_thread(load_jd_data),
+        )
         
         # Compose email (pass recipient_email if provided)
-        email_obj = compose_full_email(resume_profile, jd_data, recipient_email=email)
+        email_obj = await compose_full_email(resume_profile, jd_data, recipient_email=email)
         
         return {
             "status": "generated",
@@ -336,8 +435,29 @@ async def generate_email_endpoint(email: str = Query(None)):
         )
 
 
+def _log_failure(
+    email: Optional[str],
+    notes: str,
+    company: str = "Unknown Company",
+    role: str = "Unknown Role",
+) -> None:
+    """Record a failed /send-email attempt; a failed log write must not mask the original error."""
+    try:
+        log_application(
+            recipient_email=email or "unknown",
+            company=company,
+            role=role,
+            subject="",
+            status="failed",
+            notes=notes,
+        )
+    except Exception:
+        pass
+
+
 @router.post("/send-email", status_code=status.HTTP_200_OK)
 async def send_email_endpoint(
+    background_tasks: BackgroundTasks,
     email: str = Query(None),
     prepared: Optional[PreparedEmailPayload] = Body(None),
 ):
@@ -346,18 +466,34 @@ async def send_email_endpoint(
     If `prepared` is provided (from /prepare-application), we skip running
     decision + compose and send exactly what the user reviewed. Otherwise,
     we follow the existing decision + compose flow.
+
+    With a prepared payload carrying `to`, `company` and `role`, no stored
+    resume/JD data is read at all.
     """
 
     try:
-        # Load stored data
-        resume_profile = load_resume_profile()
-        jd_data = load_jd_data()
+        # Connect SMTP while the decision/compose steps run
+        smtp_warmup = start_smtp_warmup()
 
         decision_info = None
         decision_code = None
 
         # If prepared payload exists, use it directly to avoid second OpenAI call
         if prepared and prepared.subject and prepared.body:
+            # Read the stored JD only for fields the payload does not carry
+            jd_data = {}
+            if not (prepared.to or email) or prepared.company is None or prepared.role is None:
+                jd_data = await asyncio.to_thread(load_jd_data)
+
+            company = prepared.company
+            if company is None:
+                company = jd_data.get("company", "Unknown Company")
+            company = company.strip()
+            role = prepared.role
+            if role is None:
+                role = jd_data.get("role", "Unknown Role")
+            role = role.strip()
+
             recipient = (prepared.to or email or jd_data.get("email", "")).strip()
             if not recipient:
                 raise HTTPException(
@@ -385,10 +521,8 @@ async def send_email_endpoint(
 
             # If decision is SKIP and no override, block
             if decision_code == "SKIP":
-                company = jd_data.get("company", "Unknown Company").strip()
-                role = jd_data.get("role", "Unknown Role").strip()
-
-                log_application(
+                background_tasks.add_task(
+                    log_application,
                     recipient_email=recipient,
                     company=company,
                     role=role,
@@ -406,34 +540,42 @@ async def send_email_endpoint(
                 }
 
         else:
+            # Load stored data (both reads in parallel)
+            resume_profile, jd_data = await asyncio.gather(
+                asyncio.to_thread(load_resume_profile),
+                asyncio.to_thread(load_jd_data),
+            )
+            company = jd_data.get("company", "Unknown Company").strip()
+            role = jd_data.get("role", "Unknown Role").strip()
+
+            # Start composing as soon as the streamed decision rules out SKIP
+            compose_task: Optional["asyncio.Task[dict]"] = None
+
+            def start_compose(code: str) -> None:
+                nonlocal compose_task
+                if code != "SKIP":
+                    compose_task = asyncio.ensure_future(
+                        compose_full_email(resume_profile, jd_data, recipient_email=email)
+                    )
+
             # Run decision logic to check if should send
             try:
-                jd_profile = analyze_jd(jd_data)
-
                 if resume_profile:
-                    resume_intelligence = analyze_resume(resume_profile)
-
-                    decision = decide(jd_profile, resume_intelligence)
-                    decision_info = {
-                        "decision": decision.decision,
-                        "reasons": decision.reasons,
-                        "blockers": decision.blockers,
-                        "confidence": decision.confidence,
-                    }
-                    decision_code = decision.decision
+                    decision_info = await _run_decision_agents(
+                        jd_data, resume_profile, on_decision=start_compose
+                    )
+                    decision_code = decision_info["decision"]
 
                     # If decision is SKIP, return early without sending
-                    if decision.decision == "SKIP":
-                        company = jd_data.get("company", "Unknown Company").strip()
-                        role = jd_data.get("role", "Unknown Role").strip()
-
-                        log_application(
+                    if decision_code == "SKIP":
+                        background_tasks.add_task(
+                            log_application,
                             recipient_email=email or "unknown",
                             company=company,
                             role=role,
                             subject="",
                             status="skipped",
-                            notes=f"Decision: SKIP. Blockers: {', '.join(decision.blockers)}",
+                            notes=f"Decision: SKIP. Blockers: {', '.join(decision_info['blockers']) or 'none given'}",
                         )
 
                         return {
@@ -445,14 +587,18 @@ async def send_email_endpoint(
                         }
             except Exception as e:
                 # Log decision error but proceed with sending (safe fallback)
-                print(f"Decision agent error: {str(e)}")
+                logger.warning("Decision agent error: %s", e)
                 # Continue to send email (graceful degradation)
 
-            # Compose complete email
-            email_obj = compose_full_email(resume_profile, jd_data, recipient_email=email)
+            # Compose complete email (or finish the early start)
+            if compose_task is not None:
+                email_obj = await compose_task
+            else:
+                email_obj = await compose_full_email(resume_profile, jd_data, recipient_email=email)
 
         # Send email with resume attachment
-        send_result = send_email(
+        await smtp_warmup
+        send_result = await send_email(
             recipient_email=email_obj["to"],
             subject=email_obj["subject"],
             body=email_obj["body"],
@@ -460,21 +606,21 @@ async def send_email_endpoint(
             attach_resume=True,
         )
 
-        # Log the application
-        company = jd_data.get("company", "Unknown Company").strip()
-        role = jd_data.get("role", "Unknown Role").strip()
-
+        # Log the application after the response is sent
         notes = "Email sent successfully with resume attached"
         if decision_info:
             notes += f"; Decision: {decision_info['decision']}"
 
-        log_entry = log_application(
+        logged_at = datetime.now().isoformat()
+        background_tasks.add_task(
+            log_application,
             recipient_email=email_obj["to"],
             company=company,
             role=role,
             subject=email_obj["subject"],
             status="sent",
             notes=notes,
+            timestamp=logged_at,
         )
 
         response = {
@@ -487,7 +633,7 @@ async def send_email_endpoint(
             },
             "company": company,
             "role": role,
-            "logged_at": log_entry["timestamp"],
+            "logged_at": logged_at,
         }
 
         # Add decision info if available
@@ -498,53 +644,27 @@ async def send_email_endpoint(
 
     except FileNotFoundError as e:
         # Log failed attempt even when JD is missing
-        try:
-            log_application(
-                recipient_email=email or "unknown",
-                company="Unknown Company",
-                role="Unknown Role",
-                subject="",
-                status="failed",
-                notes=str(e),
-            )
-        finally:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=str(e),
-            )
+        _log_failure(email, str(e))
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
     except ValueError as e:
-        # Try to log failed attempt
+        company, role = "Unknown Company", "Unknown Role"
         try:
             jd_data = load_jd_data()
-            company = jd_data.get("company", "Unknown Company").strip()
-            role = jd_data.get("role", "Unknown Role").strip()
-            log_application(
-                recipient_email=email or "unknown",
-                company=company,
-                role=role,
-                subject="",
-                status="failed",
-                notes=str(e),
-            )
+            company = jd_data.get("company", company).strip()
+            role = jd_data.get("role", role).strip()
         except Exception:
             pass
+        _log_failure(email, str(e), company, role)
 
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Failed to send email: {str(e)}",
         )
     except Exception as e:
-        try:
-            log_application(
-                recipient_email=email or "unknown",
-                company="Unknown Company",
-                role="Unknown Role",
-                subject="",
-                status="failed",
-                notes=str(e),
-            )
-        except Exception:
-            pass
+        _log_failure(email, str(e))
 
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -553,13 +673,19 @@ async def send_email_endpoint(
 
 
 @router.get("/applications", status_code=status.HTTP_200_OK)
-async def get_applications_history():
-    """Get history of all sent applications.
+async def get_applications_history(
+    limit: Optional[int] = Query(None, ge=1),
+    offset: int = Query(0, ge=0),
+):
+    """Get history of sent applications.
     
-    Returns a list of all logged applications in chronological order.
+    Returns logged applications in chronological order. With ?limit=N, returns
+    the N most recent entries; ?offset=K skips the newest K entries first, with
+    or without a limit (paginate backwards with offset=0, N, 2N, ...).
     
     Returns:
-        JSON with array of application log entries, each containing:
+        JSON with total_applications (all logged entries), count (entries on
+        this page) and an array of application log entries, each containing:
         - timestamp: When the email was sent
         - recipient_email: Email address
         - company: Company name
@@ -569,13 +695,16 @@ async def get_applications_history():
         - notes: Any additional notes or error messages
     """
     try:
-        from ..mail.logger import get_application_history
+        from ..mail.logger import count_application_history, get_application_history
         
-        history = get_application_history()
+        history = get_application_history(limit=limit, offset=offset)
         
         return {
             "status": "success",
-            "total_applications": len(history),
+            "total_applications": count_application_history(),
+            "count": len(history),
+            "limit": limit,
+            "offset": offset,
             "applications": history,
         }
     except Exception as e:
@@ -20,15 +20,15 @@ async def upload_resume(file: UploadFile = File(...)):
             detail="Missing file.",
         )
 
-    # Store resume PDF
-    resume_path = await save_resume(file)
+    # Store resume PDF (hashed while it is written)
+    resume_path, resume_hash = await save_resume(file)
 
     try:
-        # Parse resume with OpenAI
-        profile = parse_resume()
+        # Parse resume with OpenAI (skipped if this PDF was parsed before)
+        profile = await parse_resume(pdf_hash=resume_hash)
 
         # Save profile to JSON
-        profile_path = save_profile(profile)
+        profile_path = await save_profile(profile)
 
         # Return response with parsed data (exclude raw_text)
         return {
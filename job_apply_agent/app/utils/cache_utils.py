@@ -0,0 +1,90 @@
+"""Shared helpers for content-addressed JSON caches under storage/."""
+
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from ..config import ensure_storage_dirs
+from .json_utils import dumps_pretty, loads
+
+# Read size used when hashing files on disk
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Parsed JSON keyed by path; each entry carries the (st_mtime_ns, st_size) it was read at
+_JSON_CACHE: Dict[Path, Tuple[int, int, Any]] = {}
+
+
+def new_hasher() -> "hashlib.blake2b":
+    """Incremental hasher matching content_hash(), for hashing data as it streams."""
+    return hashlib.blake2b(digest_size=16)
+
+
+def content_hash(data: bytes) -> str:
+    """Return a short, stable hex digest for a blob of bytes."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def file_hash(path: Path) -> str:
+    """Hash a file's contents without loading it into memory at once."""
+    h = new_hasher()
+    with Path(path).open("rb") as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def read_cached_json(path: Path) -> Optional[Any]:
+    """Return the cached JSON value, or None if missing or unreadable."""
+    try:
+        return loads(path.read_bytes())
+    except (OSError, ValueError):
+        return None
+
+
+def write_cached_json(path: Path, obj: Any) -> None:
+    """Write JSON atomically: temp file in the same directory, then os.replace.
+
+    Concurrent writers of the same key each use their own temp file, and
+    readers never see a partially written entry.
+    """
+    ensure_storage_dirs()
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(dumps_pretty(obj))
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+def load_json_cached(path: Path) -> Any:
+    """Load JSON from disk, reusing the parsed value while the file is unchanged.
+
+    A hit costs one stat. Writers should call invalidate_json_cache(path),
+    since a rewrite within the filesystem's mtime granularity that keeps
+    the size would otherwise go unnoticed.
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        ValueError: If the file is not valid JSON
+    """
+    st = path.stat()
+    key = (st.st_mtime_ns, st.st_size)
+    hit = _JSON_CACHE.get(path)
+    if hit and hit[:2] == key:
+        return hit[2]
+
+    data = loads(path.read_bytes())
+    _JSON_CACHE[path] = (*key, data)
+    return data
+
+
+def invalidate_json_cache(path: Path) -> None:
+    """Drop the parsed copy of a file cached by load_json_cached()."""
+    _JSON_CACHE.pop(path, None)
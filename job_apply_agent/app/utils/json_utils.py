@@ -0,0 +1,43 @@
+"""Shared JSON utilities.
+
+Uses orjson when it is installed and falls back to the stdlib json module
+otherwise. All helpers work on bytes so callers can use Path.read_bytes /
+Path.write_bytes directly.
+"""
+
+from json import JSONDecodeError  # orjson.JSONDecodeError subclasses it
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+    import json
+
+
+def loads(data: bytes | str) -> Any:
+    """Parse JSON from bytes or str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps_pretty(obj: Any) -> bytes:
+    """Serialize to indented, UTF-8 encoded JSON (for files humans may read)."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def dumps_canonical(obj: Any) -> bytes:
+    """Serialize compactly with sorted keys, so equal values give equal bytes (for hashing)."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def dumps_line(obj: Any) -> bytes:
+    """Serialize to compact, UTF-8 encoded JSON on a single line (for JSONL)."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
@@ -1,14 +1,37 @@
 """Shared OpenAI utilities."""
 
+import asyncio
+import functools
 import os
-import json
-import openai
+import time
+from typing import Dict
 
+from ..config import OPENAI_CACHE_DIR
+from .cache_utils import content_hash, read_cached_json, write_cached_json
+from .json_utils import JSONDecodeError, loads
 
+MODEL = "gpt-4o-mini"
+# Mixed into response-cache keys; bump to invalidate every cached response
+PROMPT_VERSION = "v2"
+# JSON mode: the model must emit a single JSON object, no prose
+RESPONSE_FORMAT = {"type": "json_object"}
+RESPONSE_CACHE_TTL_SECONDS = 7 * 86400
+# In-memory layer in front of storage/openai_cache/ (oldest entries evicted first)
+_RESPONSE_CACHE: Dict[str, dict] = {}
+_RESPONSE_CACHE_MAX_ENTRIES = 256
+# Requests currently in flight, by cache key; identical concurrent calls share one
+_INFLIGHT: Dict[str, "asyncio.Task[dict]"] = {}
+# Keep-alive connections shared by async calls (see _get_http_session)
+HTTP_POOL_SIZE = 20
+_http_session = None
+
+
+@functools.cache
 def ensure_api_key_set():
     """Ensure OpenAI API key is available in environment.
     
-    Reads OPENAI_API_KEY from environment and sets it in openai module.
+    Reads OPENAI_API_KEY from environment and sets it in openai module,
+    once per process (a failed check is not cached, so it is retried).
     
     Raises:
         ValueError: If OPENAI_API_KEY environment variable is not set
@@ -18,13 +41,59 @@ def ensure_api_key_set():
         raise ValueError(
             "OPENAI_API_KEY not set. Please set it in your .env file or environment variables."
         )
+    import openai  # deferred so importing this module stays cheap
+
     openai.api_key = api_key
 
 
-def call_openai_for_json(system_prompt: str, user_prompt: str, max_tokens: int = 1500) -> dict:
+def _get_http_session():
+    """Return the process-wide aiohttp session for async OpenAI calls.
+
+    Without one, openai<1.0 opens a new ClientSession (fresh TCP + TLS) for
+    every acreate() call. Created lazily because it must belong to the
+    running event loop.
+    """
+    global _http_session
+    if _http_session is None or _http_session.closed:
+        import aiohttp
+
+        _http_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=HTTP_POOL_SIZE),
+        )
+    return _http_session
+
+
+def bind_http_session() -> None:
+    """Make the calling task's openai.*.acreate() calls use the shared session.
+
+    openai.aiosession is a ContextVar, so this binds the current task
+    (and tasks it spawns afterwards) only.
+    """
+    import openai
+
+    openai.aiosession.set(_get_http_session())
+
+
+async def close_http_session() -> None:
+    """Close the shared OpenAI HTTP session (call on shutdown)."""
+    global _http_session
+    if _http_session is not None and not _http_session.closed:
+        await _http_session.close()
+    _http_session = None
+
+
+async def call_openai_for_json(system_prompt: str, user_prompt: str, max_tokens: int = 1500) -> dict:
     """Call OpenAI API and parse JSON response.
     
     Handles the common pattern: send prompts → get response → parse JSON.
+    The request is awaited, so independent calls can run concurrently, and
+    goes over a shared keep-alive connection pool.
+
+    Calls run at temperature 0, so parsed responses are cached by a hash of
+    (PROMPT_VERSION, model, max_tokens, RESPONSE_FORMAT, prompts) in memory
+    and under storage/openai_cache/ for RESPONSE_CACHE_TTL_SECONDS. Identical calls
+    made while one is in flight await that request instead of sending
+    their own.
     
     Args:
         system_prompt: System message (instructions for the model)
@@ -37,29 +106,88 @@ def call_openai_for_json(system_prompt: str, user_prompt: str, max_tokens: int =
     Raises:
         ValueError: If API call fails or response is invalid JSON
     """
+    cache_key = content_hash(
+        "\x1f".join(
+            (PROMPT_VERSION, MODEL, str(max_tokens), RESPONSE_FORMAT["type"], system_prompt, user_prompt)
+        ).encode("utf-8")
+    )
+    cached = _get_cached_response(cache_key)
+    if cached is not None:
+        return cached
+
+    task = _INFLIGHT.get(cache_key)
+    if task is None:
+        task = asyncio.ensure_future(_request_json(cache_key, system_prompt, user_prompt, max_tokens))
+        _INFLIGHT[cache_key] = task
+        task.add_done_callback(lambda t: _finish_inflight(cache_key, t))
+    # Shielded: one caller being cancelled must not cancel the shared request
+    return await asyncio.shield(task)
+
+
+def _finish_inflight(cache_key: str, task: "asyncio.Task[dict]") -> None:
+    _INFLIGHT.pop(cache_key, None)
+    if not task.cancelled():
+        task.exception()  # mark retrieved even if every waiter went away
+
+
+async def _request_json(cache_key: str, system_prompt: str, user_prompt: str, max_tokens: int) -> dict:
     ensure_api_key_set()
+    import openai
+
+    bind_http_session()
     
     try:
-        response = openai.ChatCompletion.create(
-            model="gpt-4o-mini",
+        response = await openai.ChatCompletion.acreate(
+            model=MODEL,
             messages=[
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_prompt},
             ],
             temperature=0,  # Deterministic output for parsing
             max_tokens=max_tokens,
+            response_format=RESPONSE_FORMAT,
         )
         
-        response_text = response["choices"][0]["message"]["content"].strip()
-        parsed = json.loads(response_text)
+        parsed = loads(response["choices"][0]["message"]["content"])
+        _put_cached_response(cache_key, parsed)
         return parsed
         
-    except json.JSONDecodeError as e:
+    except JSONDecodeError as e:
         raise ValueError(f"OpenAI response was not valid JSON: {e}")
     except Exception as e:
         raise ValueError(f"OpenAI API call failed: {e}")
 
 
+def _get_cached_response(cache_key: str) -> dict | None:
+    entry = _RESPONSE_CACHE.get(cache_key)
+    if entry is None:
+        entry = read_cached_json(OPENAI_CACHE_DIR / f"{cache_key}.json")
+        if entry is None:
+            return None
+    if entry.get("expires_at", 0) < time.time():
+        _RESPONSE_CACHE.pop(cache_key, None)
+        return None
+    _remember_response(cache_key, entry)
+    return entry["response"]
+
+
+def _remember_response(cache_key: str, entry: dict) -> None:
+    """Keep entry in memory, evicting the oldest once _RESPONSE_CACHE_MAX_ENTRIES is reached."""
+    if cache_key not in _RESPONSE_CACHE and len(_RESPONSE_CACHE) >= _RESPONSE_CACHE_MAX_ENTRIES:
+        _RESPONSE_CACHE.pop(next(iter(_RESPONSE_CACHE)))
+    _RESPONSE_CACHE[cache_key] = entry
+
+
+def _put_cached_response(cache_key: str, parsed: dict) -> None:
+    now = time.time()
+    entry = {"response": parsed, "created_at": now, "expires_at": now + RESPONSE_CACHE_TTL_SECONDS}
+    _remember_response(cache_key, entry)
+    try:
+        write_cached_json(OPENAI_CACHE_DIR / f"{cache_key}.json", entry)
+    except OSError:
+        pass  # caching is best-effort
+
+
 def fill_defaults(data: dict, defaults: dict) -> dict:
     """Fill in missing keys with default values.
     
@@ -1,15 +1,57 @@
 """Shared PDF utilities for all parsers."""
 
+import io
+import threading
+from typing import BinaryIO, Optional
+
 import pdfplumber
 
+try:
+    import pypdfium2 as pdfium
+except ImportError:  # pragma: no cover - exercised only without pypdfium2
+    pdfium = None
+
+
+# PDFium is not thread-safe, and extraction runs in worker threads (e.g. the
+# resume and JD of /prepare at once), so every use of it is serialized.
+_PDFIUM_LOCK = threading.Lock()
+
+
+def _extract_with_pdfium(source: str | BinaryIO) -> str:
+    with _PDFIUM_LOCK:
+        return _extract_pages_with_pdfium(source)
+
+
+def _extract_pages_with_pdfium(source: str | BinaryIO) -> str:
+    pdf = pdfium.PdfDocument(source)
+    try:
+        parts = []
+        for page in pdf:
+            textpage = page.get_textpage()
+            parts.append(textpage.get_text_range())
+            textpage.close()
+            page.close()
+    finally:
+        pdf.close()
+    # PDFium ends lines with CRLF; match pdfplumber's "\n"
+    return "".join(parts).replace("\r\n", "\n")
 
-def extract_text_from_pdf(pdf_path: str) -> str:
+
+def _extract_with_pdfplumber(source: str | BinaryIO) -> str:
+    with pdfplumber.open(source) as pdf:
+        return "".join(page.extract_text() or "" for page in pdf.pages)
+
+
+def extract_text_from_pdf(pdf_path: str | bytes | BinaryIO) -> str:
     """Extract text from PDF file.
     
-    Uses pdfplumber to read all pages and combine text.
+    Uses PDFium (pypdfium2) when it is installed, which is several times
+    faster than pdfplumber's pure-Python layout analysis, and falls back to
+    pdfplumber if it is missing or cannot read the file.
     
     Args:
-        pdf_path: Path to the PDF file
+        pdf_path: Path to the PDF file, the PDF contents as bytes, or a
+                  seekable binary file object
         
     Returns:
         Combined text from all pages (empty string if no text found)
@@ -18,9 +60,15 @@ def extract_text_from_pdf(pdf_path: str) -> str:
         ValueError: If PDF cannot be read
     """
     try:
-        with pdfplumber.open(pdf_path) as pdf:
-            text = "".join(page.extract_text() or "" for page in pdf.pages)
-        return text
+        source = io.BytesIO(pdf_path) if isinstance(pdf_path, bytes) else pdf_path
+        if pdfium is not None:
+            start = source.tell() if hasattr(source, "seek") else None
+            try:
+                return _extract_with_pdfium(source)
+            except Exception:
+                if start is not None:
+                    source.seek(start)
+        return _extract_with_pdfplumber(source)
     except Exception as e:
         raise ValueError(f"Failed to extract text from PDF: {e}")
 
@@ -37,3 +85,12 @@ def validate_pdf_header(file_bytes: bytes) -> bool:
         True if valid PDF header, False otherwise
     """
     return file_bytes.startswith(b"%PDF")
+
+
+def has_pdf_suffix(filename: Optional[str]) -> bool:
+    """Check for a .pdf extension, case-insensitively, ignoring trailing whitespace.
+
+    Only the last four characters are lowered, not the whole filename.
+    """
+    name = (filename or "").rstrip()
+    return name[-4:].lower() == ".pdf"
@@ -1,7 +1,13 @@
 """V2 agents package."""
 
+from .batch import decide_batch
+from .cache import load_agent_cache
+from .combined import analyze_and_decide
 from .decision_agent import decide
 from .jd_analyzer import analyze_jd
 from .resume_intelligence import analyze_resume
 
-__all__ = ["analyze_jd", "analyze_resume", "decide"]
+__all__ = ["analyze_jd", "analyze_resume", "decide", "decide_batch", "analyze_and_decide"]
+
+# Serve results persisted by earlier runs from the first request on
+load_agent_cache()
@@ -0,0 +1,141 @@
+"""Shared chat-completion call for the V2 agents.
+
+Centralizes what every agent request needs: the API key check, the shared
+keep-alive HTTP session, MODEL, the rate limits in _limits.py, a request
+timeout and retries on transient failures.
+"""
+
+import asyncio
+import inspect
+import logging
+from typing import Any, List
+
+from ...utils.openai_utils import MODEL, bind_http_session, ensure_api_key_set
+from ._limits import acquire
+from ._usage import record
+
+# (connect, total) seconds per attempt
+REQUEST_TIMEOUT = (3.0, 30.0)
+# Retries after the first attempt, with exponential backoff from RETRY_BACKOFF_SECONDS
+MAX_RETRIES = 2
+RETRY_BACKOFF_SECONDS = 0.5
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count of text (~4 characters per token), where no usage is reported."""
+    return -(-len(text) // 4)
+
+
+def _estimate_tokens(kwargs: dict) -> int:
+    """Rough prompt + completion size for the token limit."""
+    prompt = "".join(m.get("content") or "" for m in kwargs.get("messages", ()))
+    return estimate_tokens(prompt) + kwargs.get("max_tokens", 0)
+
+
+def usage_summary(response: Any) -> str:
+    """Token counts of a non-streamed reply, for debug logs.
+
+    cached_prompt_tokens is the part of the prompt served from OpenAI's
+    prompt cache (only prefixes of 1024+ tokens are cached).
+    """
+    usage = response.get("usage") or {}
+    cached = (usage.get("prompt_tokens_details") or {}).get("cached_tokens")
+    return (
+        f"prompt_tokens={usage.get('prompt_tokens')} cached_prompt_tokens={cached} "
+        f"completion_tokens={usage.get('completion_tokens')}"
+    )
+
+
+def _transient_errors() -> tuple:
+    import openai.error
+
+    return (
+        openai.error.Timeout,
+        openai.error.APIConnectionError,
+        openai.error.RateLimitError,
+        openai.error.ServiceUnavailableError,
+    )
+
+
+async def chat_completion(**kwargs: Any) -> Any:
+    """Await openai.ChatCompletion.acreate(**kwargs) with the agents' defaults.
+
+    model and request_timeout default to MODEL and REQUEST_TIMEOUT. Timeouts,
+    connection errors, rate limits and 503s are retried up to MAX_RETRIES
+    times; with stream=True only opening the stream is retried. Each attempt
+    first waits for room under the request and token rate limits.
+    """
+    ensure_api_key_set()
+    import openai
+
+    bind_http_session()
+    kwargs.setdefault("model", MODEL)
+    kwargs.setdefault("request_timeout", REQUEST_TIMEOUT)
+
+    transient = _transient_errors()
+    tokens_estimate = _estimate_tokens(kwargs)
+    for attempt in range(MAX_RETRIES + 1):
+        await acquire(tokens_estimate)
+        try:
+            return await openai.ChatCompletion.acreate(**kwargs)
+        except transient as e:
+            if attempt == MAX_RETRIES:
+                raise
+            delay = RETRY_BACKOFF_SECONDS * 2 ** attempt
+            logger.warning("OpenAI request failed (%s); retrying in %.1fs", e, delay)
+            await asyncio.sleep(delay)
+
+
+async def tuned_completion(agent: str, default_max_tokens: int, **kwargs: Any) -> Any:
+    """chat_completion under a max_tokens tuned from history, recording the reply size.
+
+    kwargs["max_tokens"] is the tuned cap (see _usage.tuned_max_tokens). A
+    reply it cut off (finish_reason "length") is asked again once with
+    default_max_tokens, since a truncated function call does not parse.
+    Truncated replies are never recorded, so the cap is only learned from
+    complete ones.
+    """
+    response = await chat_completion(**kwargs)
+    if _finish_reason(response) == "length" and kwargs.get("max_tokens", 0) < default_max_tokens:
+        logger.info("%s reply hit max_tokens=%s; retrying with %s", agent, kwargs["max_tokens"], default_max_tokens)
+        response = await chat_completion(**{**kwargs, "max_tokens": default_max_tokens})
+    if _finish_reason(response) != "length":
+        record(agent, (response.get("usage") or {}).get("completion_tokens"))
+    return response
+
+
+def _finish_reason(response: Any) -> str | None:
+    choices = response.get("choices") or [{}]
+    return choices[0].get("finish_reason")
+
+
+async def close_stream(stream: Any) -> None:
+    """Stop a stream=True reply now, releasing its connection.
+
+    openai 0.28 wraps the aiohttp response in several async generators, and
+    closing the outer one leaves the inner ones (and the response, with the
+    completion still being generated) to the garbage collector. This closes
+    the HTTP response itself, then every generator layer, innermost first.
+    """
+    layers: List[Any] = []
+    responses: List[Any] = []
+    pending = [stream]
+    while pending:
+        layer = pending.pop()
+        if any(layer is seen for seen in layers):
+            continue
+        layers.append(layer)
+        frame = getattr(layer, "ag_frame", None)
+        for value in (frame.f_locals.values() if frame is not None else ()):
+            if inspect.isasyncgen(value):
+                pending.append(value)
+            elif callable(getattr(value, "release", None)) and callable(getattr(value, "close", None)):
+                responses.append(value)  # the aiohttp ClientResponse
+
+    for response in responses:
+        response.close()  # drops the connection, so the upstream generation stops
+    for layer in reversed(layers):
+        if inspect.isasyncgen(layer):
+            await layer.aclose()
@@ -0,0 +1,52 @@
+"""Request and token rate limits shared by the V2 agents.
+
+Every agent request takes one request and an estimate of its tokens from
+per-minute token buckets (JAA_OPENAI_RPM_LIMIT / JAA_OPENAI_TPM_LIMIT)
+before it is sent, so a large batch runs at the account's ceiling instead
+of bursting into 429s and retrying.
+"""
+
+import asyncio
+import functools
+import time
+from typing import Optional, Tuple
+
+from ...config import OPENAI_RPM_LIMIT, OPENAI_TPM_LIMIT
+
+
+class _Bucket:
+    """Token bucket holding up to per_minute units, refilled continuously."""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.level = self.capacity
+        self.updated = time.monotonic()
+        # Held while waiting, so callers are served in arrival order
+        self.lock = asyncio.Lock()
+
+    async def take(self, amount: float) -> None:
+        amount = min(amount, self.capacity)  # an oversized request waits for a full bucket
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.level = min(self.capacity, self.level + (now - self.updated) * self.capacity / 60)
+                self.updated = now
+                if self.level >= amount:
+                    self.level -= amount
+                    return
+                await asyncio.sleep((amount - self.level) * 60 / self.capacity)
+
+
+@functools.cache
+def _buckets() -> Tuple[Optional[_Bucket], Optional[_Bucket]]:
+    """(requests, tokens) buckets; None where the limit is disabled."""
+    return tuple(_Bucket(limit) if limit > 0 else None for limit in (OPENAI_RPM_LIMIT, OPENAI_TPM_LIMIT))
+
+
+async def acquire(tokens_estimate: int) -> None:
+    """Wait until one more request of about tokens_estimate tokens fits the limits."""
+    requests, tokens = _buckets()
+    if requests is not None:
+        await requests.take(1)
+    if tokens is not None:
+        await tokens.take(tokens_estimate)
@@ -0,0 +1,84 @@
+"""Completion sizes of past agent calls, used to tune their max_tokens.
+
+record() appends one row per full reply to storage/agent_usage.jsonl.
+tuned_max_tokens() turns the last USAGE_WINDOW rows of an agent into a
+cap of ceil(p99 * 1.1), read once when the agent module is imported (so
+a restart picks up new history).
+"""
+
+import functools
+import math
+import os
+import tempfile
+from collections import deque
+from typing import Deque, Dict, List
+
+from ...config import AGENT_USAGE_PATH, ensure_storage_dirs
+from ...utils.json_utils import dumps_line, loads
+
+# Rows per agent the percentile is taken over, and how many are needed first
+USAGE_WINDOW = 500
+MIN_SAMPLES = 50
+HEADROOM = 1.1
+# Rewrite the file with only the kept rows once it grows past this many lines
+_COMPACT_AT_LINES = 20 * USAGE_WINDOW
+
+
+@functools.cache
+def _history() -> Dict[str, Deque[int]]:
+    try:
+        lines = AGENT_USAGE_PATH.read_bytes().splitlines()
+    except FileNotFoundError:
+        lines = []
+    history: Dict[str, Deque[int]] = {}
+    for line in lines:
+        try:
+            row = loads(line)
+            history.setdefault(row["agent"], deque(maxlen=USAGE_WINDOW)).append(int(row["completion_tokens"]))
+        except (ValueError, KeyError, TypeError):
+            continue  # skip a torn or malformed line
+    if len(lines) > _COMPACT_AT_LINES:
+        _compact(history)
+    return history
+
+
+def _compact(history: Dict[str, Deque[int]]) -> None:
+    rows: List[bytes] = [
+        dumps_line({"agent": agent, "completion_tokens": tokens})
+        for agent, window in history.items()
+        for tokens in window
+    ]
+    fd, tmp_name = tempfile.mkstemp(dir=AGENT_USAGE_PATH.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(b"".join(row + b"\n" for row in rows))
+        os.replace(tmp_name, AGENT_USAGE_PATH)
+    except OSError:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass  # compaction is best-effort
+
+
+def record(agent: str, completion_tokens: int | None) -> None:
+    """Append one reply's completion size. Best-effort: write errors are ignored."""
+    if not completion_tokens:
+        return
+    try:
+        ensure_storage_dirs()
+        with AGENT_USAGE_PATH.open("ab") as f:
+            f.write(dumps_line({"agent": agent, "completion_tokens": completion_tokens}) + b"\n")
+    except OSError:
+        pass
+
+
+def tuned_max_tokens(agent: str, default: int) -> int:
+    """ceil(p99 * HEADROOM) of the agent's recent completions, capped at default.
+
+    Returns default until MIN_SAMPLES replies have been recorded.
+    """
+    window = sorted(_history().get(agent, ()))
+    if len(window) < MIN_SAMPLES:
+        return default
+    p99 = window[min(len(window) - 1, math.ceil(0.99 * len(window)) - 1)]
+    return min(default, math.ceil(p99 * HEADROOM))
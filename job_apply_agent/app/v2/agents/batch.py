@@ -0,0 +1,79 @@
+"""Batch decisions: one resume against many job descriptions."""
+
+import asyncio
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
+
+from ...config import AGENT_MAX_CONCURRENCY
+from ...utils.cache_utils import content_hash
+from ..schemas import Decision
+from .combined import analyze_and_decide, cached_jd_profile
+from .decision_agent import decide
+from .jd_analyzer import analyze_jd
+from .resume_intelligence import analyze_resume
+
+
+async def decide_batch(
+    jd_list: List[Dict[str, Any]],
+    resume_profile: Dict[str, Any],
+    max_concurrency: Optional[int] = None,
+    combined: bool = True,
+) -> AsyncIterator[Tuple[int, Union[Decision, ValueError]]]:
+    """Decide every JD against one resume, yielding results as they finish.
+
+    The resume is analyzed once and the same ResumeIntelligence feeds every
+    decision. A JD with no cached profile (from analyze_jd or an earlier
+    combined call) goes through the combined agent (analysis and decision
+    in one request) unless combined is False; cached ones only need the
+    decision. JDs with identical text
+    (the same posting from several boards) are decided once and share the
+    result. Per-JD calls overlap, with at most max_concurrency OpenAI
+    requests in flight to stay under rate limits.
+
+    Args:
+        jd_list: JD dicts, as accepted by analyze_jd
+        resume_profile: Resume dict, as accepted by analyze_resume
+        max_concurrency: In-flight request cap (default: JAA_AGENT_MAX_CONCURRENCY)
+        combined: Use the combined agent on cache misses (False: always the
+                  separate analyze_jd and decide calls, e.g. for debugging)
+
+    Yields:
+        (index into jd_list, Decision), or (index, ValueError) if that JD failed
+
+    Raises:
+        ValueError: If the resume analysis fails
+    """
+    resume_intelligence = await analyze_resume(resume_profile)
+    semaphore = asyncio.Semaphore(max_concurrency or AGENT_MAX_CONCURRENCY)
+
+    async def decide_one(jd_data: Dict[str, Any]) -> Union[Decision, ValueError]:
+        try:
+            jd_profile = analyze_jd.lookup(jd_data) or cached_jd_profile(jd_data)
+            if jd_profile is None:
+                async with semaphore:
+                    if combined:
+                        _, decision = await analyze_and_decide(jd_data, resume_intelligence)
+                        return decision
+                    jd_profile = await analyze_jd(jd_data)
+            async with semaphore:
+                return await decide(jd_profile, resume_intelligence)
+        except ValueError as e:
+            return e
+
+    async def decide_group(indices: List[int]) -> Tuple[List[int], Union[Decision, ValueError]]:
+        return indices, await decide_one(jd_list[indices[0]])
+
+    # Analysis reads only raw_text, so JDs with the same text get the same decision
+    groups: Dict[str, List[int]] = {}
+    for i, jd_data in enumerate(jd_list):
+        groups.setdefault(content_hash((jd_data.get("raw_text", "") or "").encode("utf-8")), []).append(i)
+
+    tasks = [asyncio.ensure_future(decide_group(indices)) for indices in groups.values()]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            indices, result = await next_done
+            for index in indices:
+                yield index, result
+    finally:
+        # The consumer stopped early (or was cancelled); drop the remaining calls
+        for task in tasks:
+            task.cancel()
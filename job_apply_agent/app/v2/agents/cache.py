@@ -0,0 +1,191 @@
+"""Result cache for the V2 analysis agents.
+
+Each agent call is keyed on the canonical JSON of its input plus the
+document text the agent reads. Exact repeats are served from memory;
+inputs whose text matches a cached one once case and whitespace are
+normalized reuse that result too (any other edit, even one word, is a
+miss), and a call identical to one still running waits for it instead of
+repeating it. Entries are appended to storage/agent_cache.jsonl and
+reloaded by load_agent_cache() at startup (or on first use).
+"""
+
+import asyncio
+import functools
+import re
+import threading
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, Type
+
+from pydantic import BaseModel
+
+from ...config import AGENT_CACHE_PATH, ensure_storage_dirs
+from ...utils.cache_utils import content_hash
+from ...utils.json_utils import dumps_canonical, dumps_line, loads
+from .. import text_store
+
+_WS_RE = re.compile(r"\s+")
+
+_lock = threading.Lock()
+_loaded = False
+# key -> stored result (model fields without raw_text_id)
+_results: Dict[str, Dict[str, Any]] = {}
+# agent -> {normalized text digest: key}, for reformatted copies of a document
+_by_text: Dict[str, Dict[str, str]] = {}
+# key -> agent call currently running for it (event-loop side only)
+_inflight: Dict[str, "asyncio.Task[BaseModel]"] = {}
+
+
+def _text_digest(text: str) -> str:
+    """Digest of the text with case and runs of whitespace normalized."""
+    return content_hash(_WS_RE.sub(" ", text).strip().lower().encode("utf-8"))
+
+
+def _remember(agent: str, key: str, text_digest: Optional[str], result: Dict[str, Any]) -> None:
+    _results[key] = result
+    if text_digest is not None:
+        _by_text.setdefault(agent, {})[text_digest] = key
+
+
+def _load_locked() -> None:
+    global _loaded
+    if _loaded:
+        return
+    try:
+        lines = AGENT_CACHE_PATH.read_bytes().splitlines()
+    except FileNotFoundError:
+        lines = []
+    for line in lines:
+        try:
+            row = loads(line)
+            # Rows from before text digests (similarity sketches) only serve exact keys
+            _remember(row["agent"], row["key"], row.get("text_digest"), row["result"])
+        except (ValueError, KeyError, TypeError):
+            continue  # skip a torn or malformed line
+    _loaded = True
+
+
+def load_agent_cache() -> None:
+    """Read persisted entries into memory (idempotent)."""
+    with _lock:
+        _load_locked()
+
+
+def _lookup(agent: str, key: str, text_digest: str) -> Optional[Dict[str, Any]]:
+    hit = _results.get(key)
+    if hit is not None:
+        return hit
+    other_key = _by_text.get(agent, {}).get(text_digest)
+    return None if other_key is None else _results.get(other_key)
+
+
+def _store(agent: str, key: str, text_digest: str, result: Dict[str, Any]) -> None:
+    _remember(agent, key, text_digest, result)
+    row = {"agent": agent, "key": key, "text_digest": text_digest, "result": result}
+    try:
+        ensure_storage_dirs()
+        with AGENT_CACHE_PATH.open("ab") as f:
+            f.write(dumps_line(row) + b"\n")
+    except OSError:
+        pass  # caching is best-effort
+
+
+class AgentCache:
+    """One agent's cached results, looked up and stored without calling the agent.
+
+    Used by cached_agent, and directly by agents that produce a result as a
+    by-product (the combined agent's JD profile) and so have no single
+    function to wrap.
+
+    Args:
+        agent: Agent name (keeps agents' entries apart)
+        model: Result model; rebuilt from the cached fields on a hit
+        version: Prompt version mixed into the key, so prompt edits invalidate entries
+        text_of: Returns the document text the agent reads from its input; used
+                 for normalized-text matching and put in text_store on a hit
+    """
+
+    def __init__(
+        self,
+        agent: str,
+        model: Type[BaseModel],
+        version: str,
+        text_of: Callable[[Dict[str, Any]], str],
+    ):
+        self.agent = agent
+        self.model = model
+        self.version = version
+        self.text_of = text_of
+
+    def locate(self, data: Dict[str, Any]) -> Tuple[str, str, str]:
+        """(text, key, text digest) of an input."""
+        text = self.text_of(data)
+        digest = content_hash(dumps_canonical(data) + b"\0" + text.encode("utf-8"))
+        # The version goes into the text digest too, so prompt edits miss there as well
+        return text, f"{self.agent}:{self.version}:{digest}", f"{self.version}:{_text_digest(text)}"
+
+    def cached(self, text: str, key: str, text_digest: str) -> Optional[BaseModel]:
+        with _lock:
+            _load_locked()
+            hit = _lookup(self.agent, key, text_digest)
+        return None if hit is None else self.model.parse_obj({**hit, "raw_text_id": text_store.put(text)})
+
+    def store(self, key: str, text_digest: str, result: BaseModel) -> None:
+        with _lock:
+            _load_locked()
+            _store(self.agent, key, text_digest, result.dict(exclude={"raw_text_id"}))
+
+    def lookup(self, data: Dict[str, Any]) -> Optional[BaseModel]:
+        """Return the cached result for data, or None."""
+        return self.cached(*self.locate(data))
+
+    def remember(self, data: Dict[str, Any], result: BaseModel) -> None:
+        """Cache a result for data."""
+        _, key, text_digest = self.locate(data)
+        self.store(key, text_digest, result)
+
+
+def cached_agent(
+    agent: str,
+    model: Type[BaseModel],
+    version: str,
+    text_of: Callable[[Dict[str, Any]], str],
+):
+    """Cache an async agent that maps one input dict to a pydantic model carrying raw_text_id.
+
+    The wrapped agent also gets lookup(data), which returns a cached result
+    or None without calling it, and remember(data, result), which caches a
+    result produced elsewhere. Arguments are as for AgentCache.
+    """
+    cache = AgentCache(agent, model, version, text_of)
+
+    def decorator(func: Callable[[Dict[str, Any]], Awaitable[BaseModel]]):
+        async def run(data: Dict[str, Any], key: str, text_digest: str) -> BaseModel:
+            result = await func(data)
+            cache.store(key, text_digest, result)
+            return result
+
+        def finish(key: str, task: "asyncio.Task[BaseModel]") -> None:
+            _inflight.pop(key, None)
+            if not task.cancelled():
+                task.exception()  # mark retrieved even if every waiter went away
+
+        @functools.wraps(func)
+        async def wrapper(data: Dict[str, Any]) -> BaseModel:
+            text, key, text_digest = cache.locate(data)
+            hit = cache.cached(text, key, text_digest)
+            if hit is not None:
+                return hit
+
+            # An identical call already running is awaited instead of repeated
+            task = _inflight.get(key)
+            if task is None:
+                task = asyncio.ensure_future(run(data, key, text_digest))
+                _inflight[key] = task
+                task.add_done_callback(functools.partial(finish, key))
+            # Shielded: one caller being cancelled must not cancel the shared call
+            return await asyncio.shield(task)
+
+        wrapper.lookup = cache.lookup
+        wrapper.remember = cache.remember
+        return wrapper
+
+    return decorator
@@ -0,0 +1,124 @@
+"""Combined JD Analysis + Decision Agent.
+
+Analyzes a job description and decides against an already analyzed resume
+in one request, saving a round-trip per JD in batch runs. The JD profile
+it extracts is cached under this agent's own name and version (a different
+model and prompt than analyze_jd), so later batch runs only need decide().
+"""
+
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+from ...config import DECISION_MODEL
+from ...utils.cache_utils import content_hash
+from ...utils.json_utils import JSONDecodeError, dumps_canonical, dumps_line, loads
+from ...utils.openai_utils import PROMPT_VERSION
+from .. import text_store
+from ..schemas import Decision, JDProfile, ResumeIntelligence, parameters_schema
+from ..prompts import COMBINED_SYSTEM_PROMPT, COMBINED_USER_PROMPT
+from ._client import tuned_completion, usage_summary
+from ._usage import tuned_max_tokens
+from .decision_agent import DEFAULT_MAX_OUTPUT_TOKENS as DECISION_MAX_OUTPUT_TOKENS
+from .decision_agent import _candidate_fields, _decision_from_reply
+from .cache import AgentCache
+from .jd_analyzer import DEFAULT_MAX_OUTPUT_TOKENS as JD_MAX_OUTPUT_TOKENS
+
+
+# Output cap: the two replies it replaces, back to back; lowered to fit recorded replies
+DEFAULT_MAX_OUTPUT_TOKENS = JD_MAX_OUTPUT_TOKENS + DECISION_MAX_OUTPUT_TOKENS
+MAX_OUTPUT_TOKENS = tuned_max_tokens("analyze_and_decide", DEFAULT_MAX_OUTPUT_TOKENS)
+# The reply is a forced call to this function, so it follows both schemas
+_EMIT_FUNCTION = {
+    "name": "emit_jd_decision",
+    "description": "Record the structured job description profile and the APPLY/REVIEW/SKIP decision.",
+    "parameters": {
+        "type": "object",
+        "properties": {
+            "jd_profile": parameters_schema(JDProfile, exclude=("raw_text_id",)),
+            "decision": parameters_schema(Decision),
+        },
+        "required": ["jd_profile", "decision"],
+    },
+}
+# Cached JD profiles are only reused for the same model, prompts and output schema
+_CACHE_VERSION = content_hash(
+    b"\0".join((
+        DECISION_MODEL.encode("utf-8"),
+        PROMPT_VERSION.encode("utf-8"),
+        COMBINED_SYSTEM_PROMPT.encode("utf-8"),
+        COMBINED_USER_PROMPT.encode("utf-8"),
+        dumps_canonical(_EMIT_FUNCTION),
+    ))
+)[:12]
+_JD_PROFILES = AgentCache(
+    "analyze_and_decide",
+    JDProfile,
+    version=_CACHE_VERSION,
+    text_of=lambda jd_data: jd_data.get("raw_text", "") or "",
+)
+
+logger = logging.getLogger(__name__)
+
+
+def cached_jd_profile(jd_data: Dict[str, Any]) -> Optional[JDProfile]:
+    """JD profile a previous analyze_and_decide call extracted for jd_data, or None."""
+    return _JD_PROFILES.lookup(jd_data)
+
+
+async def analyze_and_decide(
+    jd_data: Dict[str, Any],
+    resume_intelligence: ResumeIntelligence,
+) -> Tuple[JDProfile, Decision]:
+    """Analyze JD and make the APPLY/REVIEW/SKIP decision in one call.
+
+    Args:
+        jd_data: JD dict, as accepted by analyze_jd
+        resume_intelligence: Structured resume understanding
+
+    Returns:
+        (JDProfile, Decision)
+
+    Raises:
+        ValueError: If analysis fails
+    """
+    raw_text = jd_data.get("raw_text", "") or ""
+    if not raw_text.strip():
+        raise ValueError("JD text is empty; cannot analyze")
+
+    user_prompt = COMBINED_USER_PROMPT.format(
+        raw_text=raw_text,
+        candidate=dumps_line(_candidate_fields(resume_intelligence)).decode("utf-8"),
+    )
+
+    try:
+        response = await tuned_completion(
+            "analyze_and_decide",
+            DEFAULT_MAX_OUTPUT_TOKENS,
+            model=DECISION_MODEL,
+            messages=[
+                {"role": "system", "content": COMBINED_SYSTEM_PROMPT},
+                {"role": "user", "content": user_prompt},
+            ],
+            temperature=0,
+            max_tokens=MAX_OUTPUT_TOKENS,
+            functions=[_EMIT_FUNCTION],
+            function_call={"name": _EMIT_FUNCTION["name"]},
+        )
+
+        logger.debug("analyze_and_decide %s", usage_summary(response))
+        parsed = loads(response["choices"][0]["message"]["function_call"]["arguments"])
+
+        profile = JDProfile.parse_obj({
+            "seniority_level": "unknown",  # recorded when the reply omits it
+            **(parsed.get("jd_profile") or {}),
+            "raw_text_id": text_store.put(raw_text),
+        })
+        decision = _decision_from_reply(parsed.get("decision") or {})
+
+    except JSONDecodeError as e:
+        raise ValueError(f"Combined analysis returned invalid JSON: {e}")
+    except Exception as e:
+        raise ValueError(f"Combined analysis failed: {e}")
+
+    _JD_PROFILES.remember(jd_data, profile)
+    return profile, decision
@@ -4,22 +4,291 @@ Makes APPLY/REVIEW/SKIP decision based on JD profile and resume intelligence.
 Outputs structured decision with reasons, blockers, and confidence.
 """
 
-import json
-from typing import Any, Dict
+import re
+from typing import Any, Callable, Dict, List, Optional
 
-import openai
+from ...config import ANALYZER_MODEL, DECISION_MODEL
+from ...utils.cache_utils import content_hash
+from ...utils.json_utils import JSONDecodeError, dumps_canonical, dumps_line, loads
+from ...utils.openai_utils import PROMPT_VERSION
+from ..schemas import JDProfile, ResumeIntelligence, Decision, function_spec
+from ..prompts import DECISION_AGENT_SYSTEM_PROMPT, DECISION_AGENT_USER_PROMPT
+from ._client import chat_completion, close_stream, estimate_tokens
+from ._usage import record, tuned_max_tokens
 
-from ...utils.openai_utils import ensure_api_key_set
-from ..schemas import JDProfile, ResumeIntelligence, Decision
-from ..prompts import DECISION_AGENT_SYSTEM_PROMPT
 
+_DECISION_CODES = ("APPLY", "REVIEW", "SKIP")
+# The "decision" and "confidence" members, complete, in a partially streamed reply
+_DECISION_RE = re.compile(r'"decision"\s*:\s*"([^"]*)"')
+_CONFIDENCE_RE = re.compile(r'"confidence"\s*:\s*"([^"]*)"')
+# Sole blocker of a SKIP whose stream was stopped before the reasons (see _stream_decision)
+EARLY_SKIP_NOTE = "High-confidence SKIP; reasons not generated"
 
-def decide(jd_profile: JDProfile, resume_intelligence: ResumeIntelligence) -> Decision:
+
+# Output cap: the reply is a short object (code, confidence, <=3 reasons, blockers);
+# lowered to fit recorded replies (see _usage.py)
+DEFAULT_MAX_OUTPUT_TOKENS = 250
+MAX_OUTPUT_TOKENS = tuned_max_tokens("decide", DEFAULT_MAX_OUTPUT_TOKENS)
+# The reply is a forced call to this function, so it follows the schema
+_EMIT_FUNCTION = function_spec(
+    Decision,
+    "emit_decision",
+    "Record the APPLY/REVIEW/SKIP decision.",
+)
+
+
+# DECISION_AGENT_USER_PROMPT split around {profiles} once, so a prompt is one concatenation
+_USER_PROMPT_HEAD, _USER_PROMPT_TAIL = DECISION_AGENT_USER_PROMPT.split("{profiles}")
+
+
+def _jd_fields(jd_profile: JDProfile) -> Dict[str, Any]:
+    return {
+        "company": jd_profile.company,
+        "role": jd_profile.role,
+        "seniority": jd_profile.seniority_level,
+        "domain": jd_profile.domain,
+        "tech_stack": jd_profile.tech_stack,
+        "key_requirements": jd_profile.key_requirements,
+    }
+
+
+def _candidate_fields(resume_intelligence: ResumeIntelligence) -> Dict[str, Any]:
+    return {
+        "name": resume_intelligence.name,
+        "current_role": resume_intelligence.current_role,
+        "seniority": resume_intelligence.seniority_level,
+        "domain": resume_intelligence.domain_focus,
+        "experience_years": resume_intelligence.experience_years,
+        "tech_skills": resume_intelligence.tech_skills,
+        "recent_highlights": resume_intelligence.recent_highlights,
+    }
+
+
+def _profiles_json(jd_profile: JDProfile, resume_intelligence: ResumeIntelligence) -> str:
+    return dumps_line({
+        "jd": _jd_fields(jd_profile),
+        "candidate": _candidate_fields(resume_intelligence),
+    }).decode("utf-8")
+
+
+# Mechanical cases decided without the LLM (share of the JD's tech_stack the candidate has)
+RULE_SKIP_MAX_OVERLAP = 0.2
+RULE_APPLY_MIN_OVERLAP = 0.6
+_UNKNOWN = ("", "unknown")
+
+# Spellings of one technology, after _tech_key's punctuation and suffix stripping
+_TECH_ALIASES = {
+    "postgres": "postgresql",
+    "psql": "postgresql",
+    "golang": "go",
+    "js": "javascript",
+    "ecmascript": "javascript",
+    "ts": "typescript",
+    "k8s": "kubernetes",
+    "mongo": "mongodb",
+    "amazonwebservices": "aws",
+    "googlecloud": "gcp",
+    "googlecloudplatform": "gcp",
+    "sklearn": "scikitlearn",
+}
+# "Python 3.11", "Java 17", "Angular 2+", "python3" (not "s3" or "ec2")
+_TECH_VERSION_RE = re.compile(r"(?:[\s_-]+v?|(?<=[a-z]{3})v?)\d+(?:\.\d+)*\+?$")
+# "React.js", "ReactJS", "Node js" (but not "js" itself)
+_TECH_JS_SUFFIX_RE = re.compile(r"(?<=[a-z0-9])[\s.-]?js$")
+# Keeps "+" and "#" so C++ and C# stay apart from C
+_TECH_PUNCTUATION_RE = re.compile(r"[^a-z0-9+#]")
+
+
+def _tech_key(name: str) -> str:
+    """Comparable form of a technology name, so "PostgreSQL" matches "Postgres"."""
+    key = _TECH_VERSION_RE.sub("", name.strip().lower())
+    key = _TECH_PUNCTUATION_RE.sub("", _TECH_JS_SUFFIX_RE.sub("", key))
+    return _TECH_ALIASES.get(key, key)
+
+
+# Stored decisions (see v2/store.py) are only reused for the same models, prompts,
+# output schema and rules
+_CACHE_VERSION = content_hash(
+    b"\0".join((
+        ANALYZER_MODEL.encode("utf-8"),
+        DECISION_MODEL.encode("utf-8"),
+        PROMPT_VERSION.encode("utf-8"),
+        DECISION_AGENT_SYSTEM_PROMPT.encode("utf-8"),
+        DECISION_AGENT_USER_PROMPT.encode("utf-8"),
+        dumps_canonical(_EMIT_FUNCTION),
+        dumps_canonical({
+            "skip": RULE_SKIP_MAX_OVERLAP,
+            "apply": RULE_APPLY_MIN_OVERLAP,
+            "aliases": _TECH_ALIASES,
+            "patterns": [_TECH_VERSION_RE.pattern, _TECH_JS_SUFFIX_RE.pattern, _TECH_PUNCTUATION_RE.pattern],
+        }),
+    ))
+)[:12]
+
+
+def _rule_decision(jd_profile: JDProfile, resume_intelligence: ResumeIntelligence) -> Optional[Decision]:
+    """Decide obvious matches and mismatches directly; None means ask the LLM.
+
+    SKIP: both domains known and different, and under RULE_SKIP_MAX_OVERLAP
+    of the JD's stack covered. APPLY: same known domain and seniority, and at
+    least RULE_APPLY_MIN_OVERLAP covered. Technologies are compared by
+    _tech_key, so spellings like "React.js" and "React" match.
+    """
+    # _tech_key -> the JD's spelling, for the reasons
+    jd_stack = {_tech_key(t): t for t in jd_profile.tech_stack if _tech_key(t)}
+    if not jd_stack:
+        return None
+    skills = {_tech_key(t) for t in resume_intelligence.tech_skills}
+    shared = sorted(name for key, name in jd_stack.items() if key in skills)
+    overlap = len(shared) / len(jd_stack)
+
+    jd_domain = jd_profile.domain.strip().lower()
+    cand_domain = resume_intelligence.domain_focus.strip().lower()
+    if jd_domain in _UNKNOWN or cand_domain in _UNKNOWN:
+        return None
+
+    if jd_domain != cand_domain and overlap < RULE_SKIP_MAX_OVERLAP:
+        return Decision(
+            decision="SKIP",
+            reasons=[],
+            blockers=[
+                f"Domain mismatch: role is {jd_domain}, candidate focuses on {cand_domain}",
+                f"Covers {len(shared)} of {len(jd_stack)} listed technologies",
+            ],
+            confidence="high",
+        )
+
+    jd_seniority = jd_profile.seniority_level.strip().lower()
+    if (
+        jd_domain == cand_domain
+        and jd_seniority not in _UNKNOWN
+        and jd_seniority == resume_intelligence.seniority_level.strip().lower()
+        and overlap >= RULE_APPLY_MIN_OVERLAP
+    ):
+        return Decision(
+            decision="APPLY",
+            reasons=[
+                f"Same domain ({jd_domain}) and seniority ({jd_seniority})",
+                f"Covers {len(shared)} of {len(jd_stack)} listed technologies: {', '.join(shared)}",
+            ],
+            blockers=[],
+            confidence="high",
+        )
+    return None
+
+
+def _normalize_code(raw: str) -> str:
+    code = raw.strip().upper()
+    return code if code in _DECISION_CODES else "REVIEW"  # Default to REVIEW if invalid
+
+
+def _normalize_confidence(raw: str) -> str:
+    confidence = raw.strip().lower()
+    return confidence if confidence in ("low", "medium", "high") else "medium"  # Default to medium if invalid
+
+
+def _decision_from_reply(parsed: Dict[str, Any]) -> Decision:
+    """Build a Decision from the model's reply, defaulting invalid codes."""
+    return Decision(
+        decision=_normalize_code(parsed.get("decision") or ""),
+        reasons=parsed.get("reasons", []) or [],
+        blockers=parsed.get("blockers", []) or [],
+        confidence=_normalize_confidence(parsed.get("confidence") or ""),
+    )
+
+
+async def _stream_decision(
+    model: str,
+    user_prompt: str,
+    on_decision: Optional[Callable[[str], None]],
+    escalate_low: bool,
+    max_tokens: int = MAX_OUTPUT_TOKENS,
+) -> Optional[Decision]:
+    """Stream one decision reply from model.
+
+    on_decision is called once the code and confidence have both arrived.
+    Returns None, without calling it, if escalate_low and the model is unsure.
+    A reply cut off by a tuned max_tokens is streamed again once with
+    DEFAULT_MAX_OUTPUT_TOKENS. Only complete replies are recorded for tuning.
+    """
+    response = await chat_completion(
+        model=model,
+        messages=[
+            {"role": "system", "content": DECISION_AGENT_SYSTEM_PROMPT},
+            {"role": "user", "content": user_prompt},
+        ],
+        temperature=0,
+        max_tokens=max_tokens,
+        functions=[_EMIT_FUNCTION],
+        function_call={"name": _EMIT_FUNCTION["name"]},
+        stream=True,
+    )
+
+    parts: List[str] = []
+    known = False
+    finish_reason = None
+    async for chunk in response:
+        choice = chunk["choices"][0]
+        parts.append(choice["delta"].get("function_call", {}).get("arguments", ""))
+        finish_reason = choice.get("finish_reason") or finish_reason
+        if known:
+            continue
+        text = "".join(parts)
+        code_match = _DECISION_RE.search(text)
+        confidence_match = code_match and _CONFIDENCE_RE.search(text)
+        if not confidence_match:
+            continue
+        known = True
+        code = _normalize_code(code_match.group(1))
+        confidence = _normalize_confidence(confidence_match.group(1))
+        if escalate_low and confidence == "low":
+            await close_stream(response)
+            return None
+        if on_decision is not None:
+            on_decision(code)
+        if code == "SKIP" and confidence == "high":
+            # Nothing downstream needs the reasons for a sure SKIP; stop generating them
+            await close_stream(response)
+            return Decision(decision="SKIP", confidence="high", reasons=[], blockers=[EARLY_SKIP_NOTE])
+
+    text = "".join(parts)
+    if finish_reason == "length":
+        if max_tokens >= DEFAULT_MAX_OUTPUT_TOKENS:
+            raise ValueError(f"decision reply exceeded max_tokens={max_tokens}")
+        # on_decision has fired already if the code arrived before the cut
+        return await _stream_decision(
+            model, user_prompt, None if known else on_decision, escalate_low, DEFAULT_MAX_OUTPUT_TOKENS
+        )
+    # Streams report no usage; estimate it from the complete reply
+    record("decide", estimate_tokens(text))
+    decision = _decision_from_reply(loads(text))
+    if escalate_low and decision.confidence == "low":
+        return None
+    if not known and on_decision is not None:
+        on_decision(decision.decision)
+    return decision
+
+
+async def decide(
+    jd_profile: JDProfile,
+    resume_intelligence: ResumeIntelligence,
+    on_decision: Optional[Callable[[str], None]] = None,
+) -> Decision:
     """Make APPLY/REVIEW/SKIP decision.
+
+    Clear-cut cases (see _rule_decision) are decided locally. Otherwise
+    ANALYZER_MODEL decides first, and a low-confidence answer is dropped and
+    asked again of DECISION_MODEL. Replies are streamed: as soon as the
+    kept reply's "decision" and "confidence" members have arrived,
+    on_decision (if given) is called with the code, so callers can start
+    dependent work while the reasons are still being generated. A SKIP
+    streamed with high confidence ends the stream there and is returned
+    without reasons; its only blocker is EARLY_SKIP_NOTE.
     
     Args:
         jd_profile: Structured JD understanding
         resume_intelligence: Structured resume understanding
+        on_decision: Optional callback, called once with the decision code
         
     Returns:
         Decision with decision code, reasons, blockers, confidence
@@ -27,65 +296,22 @@ def decide(jd_profile: JDProfile, resume_intelligence: ResumeIntelligence) -> De
     Raises:
         ValueError: If decision fails
     """
-    ensure_api_key_set()
-    
-    user_prompt = f"""Make a hiring decision for this candidate.
-
-JD Requirements:
-- Company: {jd_profile.company}
-- Role: {jd_profile.role}
-- Seniority: {jd_profile.seniority_level}
-- Domain: {jd_profile.domain}
-- Tech Stack: {', '.join(jd_profile.tech_stack) if jd_profile.tech_stack else 'Not specified'}
-- Key Requirements: {', '.join(jd_profile.key_requirements) if jd_profile.key_requirements else 'Not specified'}
-
-Candidate Profile:
-- Name: {resume_intelligence.name}
-- Current Role: {resume_intelligence.current_role}
-- Seniority: {resume_intelligence.seniority_level}
-- Domain: {resume_intelligence.domain_focus}
-- Experience Years: {resume_intelligence.experience_years}
-- Tech Skills: {', '.join(resume_intelligence.tech_skills) if resume_intelligence.tech_skills else 'Not specified'}
-- Recent Highlights: {'; '.join(resume_intelligence.recent_highlights) if resume_intelligence.recent_highlights else 'Not specified'}
+    ruled = _rule_decision(jd_profile, resume_intelligence)
+    if ruled is not None:
+        if on_decision is not None:
+            on_decision(ruled.decision)
+        return ruled
 
-Make a decision: APPLY (strong match), REVIEW (unclear/partial match), or SKIP (blockers exist).
-
-Return JSON only."""
+    user_prompt = _USER_PROMPT_HEAD + _profiles_json(jd_profile, resume_intelligence) + _USER_PROMPT_TAIL
 
     try:
-        response = openai.ChatCompletion.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": DECISION_AGENT_SYSTEM_PROMPT},
-                {"role": "user", "content": user_prompt},
-            ],
-            temperature=0,
-            max_tokens=500,
-        )
-        
-        response_text = response["choices"][0]["message"]["content"].strip()
-        parsed = json.loads(response_text)
-        
-        # Validate decision code
-        decision_code = parsed.get("decision", "").strip().upper()
-        if decision_code not in ("APPLY", "REVIEW", "SKIP"):
-            decision_code = "REVIEW"  # Default to REVIEW if invalid
-        
-        # Construct Decision
-        decision = Decision(
-            decision=decision_code,
-            reasons=parsed.get("reasons", []) or [],
-            blockers=parsed.get("blockers", []) or [],
-            confidence=parsed.get("confidence", "medium").strip().lower(),
-        )
-        
-        # Validate confidence
-        if decision.confidence not in ("low", "medium", "high"):
-            decision.confidence = "medium"
-        
+        escalate = ANALYZER_MODEL != DECISION_MODEL
+        decision = await _stream_decision(ANALYZER_MODEL, user_prompt, on_decision, escalate_low=escalate)
+        if decision is None:
+            decision = await _stream_decision(DECISION_MODEL, user_prompt, on_decision, escalate_low=False)
         return decision
         
-    except json.JSONDecodeError as e:
+    except JSONDecodeError as e:
         raise ValueError(f"Decision analysis returned invalid JSON: {e}")
     except Exception as e:
         raise ValueError(f"Decision analysis failed: {e}")
@@ -4,17 +4,52 @@ Extracts structured understanding of a job description.
 Does NOT know anything about the resume.
 """
 
-import json
+import logging
 from typing import Any, Dict
 
-import openai
+from ...config import ANALYZER_MODEL
+from ...utils.cache_utils import content_hash
+from ...utils.json_utils import JSONDecodeError, dumps_canonical, loads
+from ...utils.openai_utils import PROMPT_VERSION
+from ..schemas import JDProfile, function_spec
+from .. import text_store
+from ..prompts import JD_ANALYZER_SYSTEM_PROMPT, JD_ANALYZER_USER_PROMPT
+from ._client import tuned_completion, usage_summary
+from ._usage import tuned_max_tokens
+from .cache import cached_agent
 
-from ...utils.openai_utils import ensure_api_key_set
-from ..schemas import JDProfile
-from ..prompts import JD_ANALYZER_SYSTEM_PROMPT
 
+# Output cap: six short fields, two of them lists; lowered to fit recorded replies (see _usage.py)
+DEFAULT_MAX_OUTPUT_TOKENS = 300
+MAX_OUTPUT_TOKENS = tuned_max_tokens("analyze_jd", DEFAULT_MAX_OUTPUT_TOKENS)
+# The reply is a forced call to this function, so it follows the schema
+_EMIT_FUNCTION = function_spec(
+    JDProfile,
+    "emit_jd_profile",
+    "Record the structured job description profile.",
+    exclude=("raw_text_id",),
+)
+# Cached results are only reused for the same model, prompts and output schema
+_CACHE_VERSION = content_hash(
+    b"\0".join((
+        ANALYZER_MODEL.encode("utf-8"),
+        PROMPT_VERSION.encode("utf-8"),
+        JD_ANALYZER_SYSTEM_PROMPT.encode("utf-8"),
+        JD_ANALYZER_USER_PROMPT.encode("utf-8"),
+        dumps_canonical(_EMIT_FUNCTION),
+    ))
+)[:12]
 
-def analyze_jd(jd_data: Dict[str, Any]) -> JDProfile:
+logger = logging.getLogger(__name__)
+
+
+@cached_agent(
+    "analyze_jd",
+    JDProfile,
+    version=_CACHE_VERSION,
+    text_of=lambda jd_data: jd_data.get("raw_text", "") or "",
+)
+async def analyze_jd(jd_data: Dict[str, Any]) -> JDProfile:
     """Analyze JD and extract structured profile.
     
     Args:
@@ -26,46 +61,37 @@ def analyze_jd(jd_data: Dict[str, Any]) -> JDProfile:
     Raises:
         ValueError: If analysis fails
     """
-    ensure_api_key_set()
-    
     raw_text = jd_data.get("raw_text", "") or ""
     if not raw_text.strip():
         raise ValueError("JD text is empty; cannot analyze")
     
-    user_prompt = f"""Analyze this job description and extract structured requirements:
-
-{raw_text}
-
-Return JSON only."""
+    user_prompt = JD_ANALYZER_USER_PROMPT.format(raw_text=raw_text)
 
     try:
-        response = openai.ChatCompletion.create(
-            model="gpt-4o-mini",
+        response = await tuned_completion(
+            "analyze_jd",
+            DEFAULT_MAX_OUTPUT_TOKENS,
+            model=ANALYZER_MODEL,
             messages=[
                 {"role": "system", "content": JD_ANALYZER_SYSTEM_PROMPT},
                 {"role": "user", "content": user_prompt},
             ],
             temperature=0,
-            max_tokens=500,
+            max_tokens=MAX_OUTPUT_TOKENS,
+            functions=[_EMIT_FUNCTION],
+            function_call={"name": _EMIT_FUNCTION["name"]},
         )
         
-        response_text = response["choices"][0]["message"]["content"].strip()
-        parsed = json.loads(response_text)
+        # Output length drives latency (MAX_OUTPUT_TOKENS is tuned against it); cached prompt tokens skip prefill
+        logger.debug("analyze_jd %s", usage_summary(response))
+        parsed = loads(response["choices"][0]["message"]["function_call"]["arguments"])
         
-        # Construct JDProfile
-        profile = JDProfile(
-            company=parsed.get("company", "").strip(),
-            role=parsed.get("role", "").strip(),
-            key_requirements=parsed.get("key_requirements", []) or [],
-            seniority_level=parsed.get("seniority_level", "unknown").strip(),
-            tech_stack=parsed.get("tech_stack", []) or [],
-            domain=parsed.get("domain", "").strip(),
-            raw_text=raw_text,
-        )
+        # Missing seniority is recorded as "unknown" rather than left blank
+        profile = JDProfile.parse_obj({"seniority_level": "unknown", **parsed, "raw_text_id": text_store.put(raw_text)})
         
         return profile
         
-    except json.JSONDecodeError as e:
+    except JSONDecodeError as e:
         raise ValueError(f"JD analysis returned invalid JSON: {e}")
     except Exception as e:
         raise ValueError(f"JD analysis failed: {e}")
@@ -4,22 +4,139 @@ Extracts structured understanding of a resume.
 Does NOT know anything about the job description.
 """
 
-import json
-from typing import Any, Dict
+import logging
+import re
+from typing import Any, Dict, Optional
 
-import openai
+from ...email.generator import load_resume_raw
+from ...config import ANALYZER_MODEL
+from ...utils.cache_utils import content_hash
+from ...utils.json_utils import JSONDecodeError, dumps_canonical, loads
+from ...utils.openai_utils import PROMPT_VERSION
+from ..schemas import ResumeIntelligence, function_spec
+from .. import text_store
+from ..prompts import RESUME_INTELLIGENCE_SYSTEM_PROMPT, RESUME_INTELLIGENCE_USER_PROMPT
+from ._client import tuned_completion, usage_summary
+from ._usage import tuned_max_tokens
+from .cache import cached_agent
 
-from ...utils.openai_utils import ensure_api_key_set
-from ..schemas import ResumeIntelligence
-from ..prompts import RESUME_INTELLIGENCE_SYSTEM_PROMPT
 
+# Output cap: seven short fields; highlights are the longest; lowered to fit recorded replies (see _usage.py)
+DEFAULT_MAX_OUTPUT_TOKENS = 300
+MAX_OUTPUT_TOKENS = tuned_max_tokens("analyze_resume", DEFAULT_MAX_OUTPUT_TOKENS)
+# The reply is a forced call to this function, so it follows the schema
+_EMIT_FUNCTION = function_spec(
+    ResumeIntelligence,
+    "emit_resume_intelligence",
+    "Record the structured resume profile.",
+    exclude=("raw_text_id",),
+)
+# Cached results are only reused for the same model, prompts and output schema
+_CACHE_VERSION = content_hash(
+    b"\0".join((
+        ANALYZER_MODEL.encode("utf-8"),
+        PROMPT_VERSION.encode("utf-8"),
+        RESUME_INTELLIGENCE_SYSTEM_PROMPT.encode("utf-8"),
+        RESUME_INTELLIGENCE_USER_PROMPT.encode("utf-8"),
+        dumps_canonical(_EMIT_FUNCTION),
+    ))
+)[:12]
 
-def analyze_resume(resume_profile: Dict[str, Any]) -> ResumeIntelligence:
+# Parsed profile fields that must all be present to skip the LLM
+_PARSED_FIELDS = ("name", "current_title", "skills", "total_experience_years")
+# Domain named in a job title. Only used when exactly one pattern matches: modifiers
+# like "Backend Engineer, Data Platform" name several and go to the LLM. Generic words
+# (platform, api, ui, bi) are left out, since they qualify titles in any domain.
+_TITLE_DOMAINS = (
+    ("fullstack", re.compile(r"\bfull[\s-]?stack\b")),
+    ("ml", re.compile(r"\b(machine learning|ml|ai|deep learning|nlp|computer vision)\b")),
+    ("data", re.compile(r"\b(data|analytics|etl)\b")),
+    ("devops", re.compile(r"\b(devops|sre|site reliability|infrastructure|cloud)\b")),
+    ("frontend", re.compile(r"\bfront[\s-]?end\b")),
+    ("backend", re.compile(r"\b(back[\s-]?end|server[\s-]?side)\b")),
+)
+_SENIOR_TITLE_RE = re.compile(r"\b(senior|sr|lead|staff|principal|head)\b")
+_JUNIOR_TITLE_RE = re.compile(r"\b(junior|jr|intern|graduate|entry[\s-]level|trainee)\b")
+
+logger = logging.getLogger(__name__)
+
+
+def _from_parsed_profile(resume_profile: Dict[str, Any]) -> Optional[ResumeIntelligence]:
+    """Build ResumeIntelligence from the resume parser's fields, or None if they fall short.
+
+    Seniority comes from the title (or else the years of experience) and the
+    domain from the title; a title that names no domain, or more than one,
+    needs the LLM.
+    """
+    if not all(resume_profile.get(k) for k in _PARSED_FIELDS):
+        return None
+    title = str(resume_profile["current_title"]).lower()
+    domains = [name for name, pattern in _TITLE_DOMAINS if pattern.search(title)]
+    if len(domains) != 1:
+        return None
+    domain = domains[0]
+
+    years = int(resume_profile["total_experience_years"] or 0)
+    if _SENIOR_TITLE_RE.search(title):
+        seniority = "senior"
+    elif _JUNIOR_TITLE_RE.search(title):
+        seniority = "junior"
+    else:
+        seniority = "junior" if years < 2 else "mid" if years < 5 else "senior"
+
+    highlights = [*(resume_profile.get("experience") or [])[:2], *(resume_profile.get("projects") or [])[:1]]
+    return ResumeIntelligence.parse_obj({
+        "name": resume_profile["name"],
+        "current_role": resume_profile["current_title"],
+        "seniority_level": seniority,
+        "tech_skills": resume_profile["skills"],
+        "domain_focus": domain,
+        "experience_years": years,
+        "recent_highlights": highlights,
+        "raw_text_id": text_store.put(resume_profile.get("raw_text", "") or load_resume_raw()),
+    })
+
+
+async def analyze_resume(resume_profile: Dict[str, Any]) -> ResumeIntelligence:
     """Analyze resume and extract structured intelligence.
+
+    When the resume parser already extracted name, title, skills and years
+    and the title names exactly one domain, the profile is built from those fields
+    without an LLM call; otherwise the Resume Intelligence Agent runs.
+
+    Args:
+        resume_profile: Resume dict with keys: name, current_title, summary, skills,
+                        experience, projects, total_experience_years, and optionally
+                        raw_text (read from storage/resume_raw.txt when absent)
+
+    Returns:
+        ResumeIntelligence with structured understanding
+
+    Raises:
+        ValueError: If analysis fails
+    """
+    try:
+        direct = _from_parsed_profile(resume_profile)
+    except (TypeError, ValueError):
+        direct = None  # malformed parser fields; let the agent read the text instead
+    if direct is not None:
+        return direct
+    return await _analyze_resume_with_llm(resume_profile)
+
+
+@cached_agent(
+    "analyze_resume",
+    ResumeIntelligence,
+    version=_CACHE_VERSION,
+    text_of=lambda resume_profile: resume_profile.get("raw_text", "") or load_resume_raw(),
+)
+async def _analyze_resume_with_llm(resume_profile: Dict[str, Any]) -> ResumeIntelligence:
+    """Analyze resume with the LLM and extract structured intelligence.
     
     Args:
         resume_profile: Resume dict with keys: name, current_title, summary, skills, 
-                        experience, projects, raw_text
+                        experience, projects, and optionally raw_text (read from
+                        storage/resume_raw.txt when absent)
         
     Returns:
         ResumeIntelligence with structured understanding
@@ -27,52 +144,46 @@ def analyze_resume(resume_profile: Dict[str, Any]) -> ResumeIntelligence:
     Raises:
         ValueError: If analysis fails
     """
-    ensure_api_key_set()
-    
-    raw_text = resume_profile.get("raw_text", "") or ""
+    raw_text = resume_profile.get("raw_text", "") or load_resume_raw()
     if not raw_text.strip():
         raise ValueError("Resume text is empty; cannot analyze")
     
-    user_prompt = f"""Analyze this resume and extract structured intelligence about the candidate:
-
-{raw_text}
-
-Return JSON only."""
+    user_prompt = RESUME_INTELLIGENCE_USER_PROMPT.format(raw_text=raw_text)
 
     try:
-        response = openai.ChatCompletion.create(
-            model="gpt-4o-mini",
+        response = await tuned_completion(
+            "analyze_resume",
+            DEFAULT_MAX_OUTPUT_TOKENS,
+            model=ANALYZER_MODEL,
             messages=[
                 {"role": "system", "content": RESUME_INTELLIGENCE_SYSTEM_PROMPT},
                 {"role": "user", "content": user_prompt},
             ],
             temperature=0,
-            max_tokens=500,
+            max_tokens=MAX_OUTPUT_TOKENS,
+            functions=[_EMIT_FUNCTION],
+            function_call={"name": _EMIT_FUNCTION["name"]},
         )
         
-        response_text = response["choices"][0]["message"]["content"].strip()
-        parsed = json.loads(response_text)
+        # Output length drives latency (MAX_OUTPUT_TOKENS is tuned against it); cached prompt tokens skip prefill
+        logger.debug("analyze_resume %s", usage_summary(response))
+        parsed = loads(response["choices"][0]["message"]["function_call"]["arguments"])
 
         # Prefer deterministic years from pre-parsed resume if available
         resume_years = int(resume_profile.get("total_experience_years", 0) or 0)
         llm_years = int(parsed.get("experience_years", 0) or 0)
         experience_years = resume_years if resume_years > 0 else llm_years
         
-        # Construct ResumeIntelligence
-        intelligence = ResumeIntelligence(
-            name=parsed.get("name", "").strip(),
-            current_role=parsed.get("current_role", "").strip(),
-            seniority_level=parsed.get("seniority_level", "unknown").strip(),
-            tech_skills=parsed.get("tech_skills", []) or [],
-            domain_focus=parsed.get("domain_focus", "").strip(),
-            experience_years=experience_years,
-            recent_highlights=parsed.get("recent_highlights", []) or [],
-            raw_text=raw_text,
-        )
+        intelligence = ResumeIntelligence.parse_obj({
+            "seniority_level": "unknown",  # recorded when the reply omits it
+            **parsed,
+            "experience_years": experience_years,
+            "raw_text_id": text_store.put(raw_text),
+        })
         
         return intelligence
         
-    except json.JSONDecodeError as e:
+    except JSONDecodeError as e:
         raise ValueError(f"Resume analysis returned invalid JSON: {e}")
     except Exception as e:
         raise ValueError(f"Resume analysis failed: {e}")
@@ -26,7 +26,7 @@ Rules:
 - tech_stack: list of explicit technologies/frameworks/languages mentioned
 - domain: best guess based on role and tech stack
 - Use empty arrays for missing skills
-- Return valid JSON only
+- Return valid JSON only, minified (no whitespace or line breaks)
 """
 
 RESUME_INTELLIGENCE_SYSTEM_PROMPT = """You are analyzing a resume to extract structured intelligence about the candidate.
@@ -58,7 +58,7 @@ Rules:
 - experience_years: total professional years (estimate as integer)
 - recent_highlights: 2-3 most recent or impactful projects/roles (short strings)
 - Use empty arrays for missing skills/highlights
-- Return valid JSON only
+- Return valid JSON only, minified (no whitespace or line breaks)
 """
 
 DECISION_AGENT_SYSTEM_PROMPT = """You are making a hiring decision for a candidate based on JD requirements and resume intelligence.
@@ -77,9 +77,9 @@ Decision logic:
 Return a JSON object:
 {
   "decision": "APPLY | REVIEW | SKIP",
+  "confidence": "low | medium | high",
   "reasons": ["reason1", "reason2", ...],
-  "blockers": ["blocker1", "blocker2", ...],
-  "confidence": "low | medium | high"
+  "blockers": ["blocker1", "blocker2", ...]
 }
 
 Rules:
@@ -89,11 +89,88 @@ Rules:
 - Be explicit and avoid vague language
 - If domain mismatch, include it in blockers
 - If seniority too far off, include it in blockers
-- Return valid JSON only
+- Return valid JSON only, minified (no whitespace or line breaks)
 """
 
+COMBINED_SYSTEM_PROMPT = """You are analyzing a job description and deciding whether an already profiled candidate should apply.
+
+Your task:
+- Extract the JD profile from the job description alone: company, role, key technical requirements, seniority level, tech stack, and problem domain
+- Then compare it with the candidate profile and output a decision: APPLY, REVIEW, or SKIP, with reasons, blockers, and confidence
+- Be conservative: only include requirements the JD mentions, and only APPLY on strong match
+
+Return a JSON object:
+{
+  "jd_profile": {
+    "company": "company name or empty string",
+    "role": "job title or empty string",
+    "key_requirements": ["requirement1", "requirement2", ...],
+    "seniority_level": "junior | mid | senior | unknown",
+    "tech_stack": ["tech1", "tech2", ...],
+    "domain": "backend | frontend | fullstack | data | devops | ml | other"
+  },
+  "decision": {
+    "decision": "APPLY | REVIEW | SKIP",
+    "confidence": "low | medium | high",
+    "reasons": ["reason1", "reason2", ...],
+    "blockers": ["blocker1", "blocker2", ...]
+  }
+}
+
+Rules:
+- jd_profile follows the JD analysis rules: empty strings/arrays when missing, 3-5 key_requirements, seniority inferred from language or "unknown", domain as best guess
+- APPLY: strong match on seniority level, domain, and key skills
+- REVIEW: partial match, unclear fit, or any ambiguity
+- SKIP: explicit blockers such as seniority mismatch, completely wrong domain, or missing critical requirements
+- reasons: positive signals (max 3); blockers: issues or concerns (empty if none)
+- If domain mismatch or seniority too far off, include it in blockers
+- Return valid JSON only, minified (no whitespace or line breaks)
+"""
+
+# User-message templates, filled with str.format (placeholders are the only
+# parsed braces, so document text may contain anything)
+JD_ANALYZER_USER_PROMPT = """Analyze this job description and extract structured requirements:
+
+{raw_text}
+
+Return JSON only."""
+
+RESUME_INTELLIGENCE_USER_PROMPT = """Analyze this resume and extract structured intelligence about the candidate:
+
+{raw_text}
+
+Return JSON only."""
+
+# {profiles} is the compact JSON from decision_agent._profiles_json: it
+# tokenizes tighter than labeled prose lines
+DECISION_AGENT_USER_PROMPT = """Make a hiring decision for this candidate (JD and candidate profiles as JSON):
+
+{profiles}
+
+Make a decision: APPLY (strong match), REVIEW (unclear/partial match), or SKIP (blockers exist).
+
+Return JSON only."""
+
+# {candidate} is the candidate half of decision_agent._profiles_json
+COMBINED_USER_PROMPT = """Analyze this job description and make a hiring decision for the candidate below.
+
+Job description:
+
+{raw_text}
+
+Candidate profile (JSON):
+
+{candidate}
+
+Return JSON only."""
+
 __all__ = [
     "JD_ANALYZER_SYSTEM_PROMPT",
     "RESUME_INTELLIGENCE_SYSTEM_PROMPT",
     "DECISION_AGENT_SYSTEM_PROMPT",
+    "COMBINED_SYSTEM_PROMPT",
+    "JD_ANALYZER_USER_PROMPT",
+    "RESUME_INTELLIGENCE_USER_PROMPT",
+    "DECISION_AGENT_USER_PROMPT",
+    "COMBINED_USER_PROMPT",
 ]
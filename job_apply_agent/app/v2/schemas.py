@@ -4,12 +4,28 @@ Defines shared data structures for decision agents.
 Ensures clear contracts between JD analysis, resume intelligence, and decision logic.
 """
 
-from typing import List, Literal
+import copy
+from typing import Any, Dict, List, Literal, Tuple, Type
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, root_validator
 
 
-class JDProfile(BaseModel):
+class _AgentOutput(BaseModel):
+    """Base for profiles parsed from an agent reply in one parse_obj() call.
+
+    Strings (list items included) are stripped and null members fall back to
+    the field default, so agents need no per-field cleanup.
+    """
+
+    class Config:
+        anystr_strip_whitespace = True
+
+    @root_validator(pre=True)
+    def _drop_nulls(cls, values: Dict[str, Any]) -> Dict[str, Any]:
+        return {k: v for k, v in values.items() if v is not None}
+
+
+class JDProfile(_AgentOutput):
     """Structured understanding of a job description.
     
     Extracted by JD Analysis Agent.
@@ -34,13 +50,13 @@ class JDProfile(BaseModel):
         default="",
         description="Problem domain: backend | frontend | fullstack | data | devops | etc."
     )
-    raw_text: str = Field(
+    raw_text_id: str = Field(
         default="",
-        description="Full JD text for reference"
+        description="Id of the full JD text in v2.text_store"
     )
 
 
-class ResumeIntelligence(BaseModel):
+class ResumeIntelligence(_AgentOutput):
     """Structured understanding of a resume.
     
     Extracted by Resume Intelligence Agent.
@@ -69,21 +85,25 @@ class ResumeIntelligence(BaseModel):
         default_factory=list,
         description="Recent projects, achievements, or responsibilities"
     )
-    raw_text: str = Field(
+    raw_text_id: str = Field(
         default="",
-        description="Full resume text for reference"
+        description="Id of the full resume text in v2.text_store"
     )
 
 
 class Decision(BaseModel):
     """Decision output from Decision Agent.
     
-    Includes decision code, reasoning, blockers, and confidence.
+    Includes decision code, confidence, reasoning, and blockers.
     """
 
     decision: Literal["APPLY", "REVIEW", "SKIP"] = Field(
         description="APPLY: send email immediately. REVIEW: user should review. SKIP: do not apply."
     )
+    # Second, so a streamed reply has both codes before the reasons (see decide)
+    confidence: Literal["low", "medium", "high"] = Field(
+        description="Confidence level in the decision"
+    )
     reasons: List[str] = Field(
         default_factory=list,
         description="Positive signals and rationale for the decision"
@@ -92,6 +112,29 @@ class Decision(BaseModel):
         default_factory=list,
         description="Issues, mismatches, or concerns"
     )
-    confidence: Literal["low", "medium", "high"] = Field(
-        description="Confidence level in the decision"
-    )
+
+
+def parameters_schema(model: Type[BaseModel], exclude: Tuple[str, ...] = ()) -> Dict[str, Any]:
+    """The model's JSON schema without its title and the fields in `exclude`."""
+    schema = copy.deepcopy(model.schema())  # .schema() returns pydantic's cached dict
+    schema.pop("title", None)
+    for field in exclude:
+        schema["properties"].pop(field, None)
+        if field in schema.get("required", ()):
+            schema["required"].remove(field)
+    return schema
+
+
+def function_spec(
+    model: Type[BaseModel],
+    name: str,
+    description: str,
+    exclude: Tuple[str, ...] = (),
+) -> Dict[str, Any]:
+    """OpenAI function definition whose parameters are the model's JSON schema.
+
+    Forcing a call to it constrains the reply to the schema, e.g. Literal
+    fields become enums. Fields in `exclude` (like raw_text_id, which the
+    agent fills in itself) are left out.
+    """
+    return {"name": name, "description": description, "parameters": parameters_schema(model, exclude)}
@@ -0,0 +1,36 @@
+"""Latest V2 decision, stored next to current_jd.json and keyed on its inputs."""
+
+from typing import Any, Dict, Optional
+
+from ..config import DECISION_PATH
+from ..utils.cache_utils import content_hash, read_cached_json, write_cached_json
+from ..utils.json_utils import dumps_canonical
+from .agents import decision_agent, jd_analyzer, resume_intelligence
+
+# A stored decision is only reused while none of the agents that made it changed
+_DECISION_VERSION = "\0".join((
+    jd_analyzer._CACHE_VERSION,
+    resume_intelligence._CACHE_VERSION,
+    decision_agent._CACHE_VERSION,
+))
+
+
+def decision_key(jd_data: Dict[str, Any], resume_profile: Dict[str, Any]) -> str:
+    """Stable key over the JD and resume profile a decision was made for, and the agent versions."""
+    return content_hash(dumps_canonical({"v": _DECISION_VERSION, "j": jd_data, "r": resume_profile}))
+
+
+def load_decision(key: str) -> Optional[Dict[str, Any]]:
+    """Return the stored decision info if it was made for these inputs, else None."""
+    entry = read_cached_json(DECISION_PATH)
+    if not entry or entry.get("key") != key:
+        return None
+    return entry.get("decision")
+
+
+def save_decision(key: str, decision_info: Dict[str, Any]) -> None:
+    """Store decision info as storage/decision.json. Best-effort: write errors are ignored."""
+    try:
+        write_cached_json(DECISION_PATH, {"key": key, "decision": decision_info})
+    except OSError:
+        pass
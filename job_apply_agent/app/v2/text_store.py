@@ -0,0 +1,31 @@
+"""In-memory store for the source texts behind V2 profiles.
+
+Profiles carry only raw_text_id (the text's content_hash), so the JD or
+resume text is held once here rather than copied into every profile that
+goes through tasks and caches. Oldest texts are evicted first.
+"""
+
+from typing import Dict, Optional
+
+from ..utils.cache_utils import content_hash
+
+MAX_TEXTS = 256
+
+_texts: Dict[str, str] = {}
+
+
+def put(text: str) -> str:
+    """Store text and return its id."""
+    text_id = content_hash(text.encode("utf-8"))
+    if text_id in _texts:
+        _texts[text_id] = _texts.pop(text_id)  # most recently used goes last
+        return text_id
+    if len(_texts) >= MAX_TEXTS:
+        _texts.pop(next(iter(_texts)))
+    _texts[text_id] = text
+    return text_id
+
+
+def get(text_id: str) -> Optional[str]:
+    """Return the text stored under text_id, or None if unknown or evicted."""
+    return _texts.get(text_id)
@@ -0,0 +1,131 @@
+"""Tests for the rule-based decisions and reply streaming in app/v2/agents/decision_agent.py.
+
+Run from the repository root: python -m unittest discover job_apply_agent/tests
+"""
+
+import unittest
+from unittest import mock
+
+from job_apply_agent.app.v2.agents import decision_agent
+from job_apply_agent.app.v2.agents.decision_agent import (
+    EARLY_SKIP_NOTE,
+    RULE_APPLY_MIN_OVERLAP,
+    RULE_SKIP_MAX_OVERLAP,
+    _rule_decision,
+    _stream_decision,
+    _tech_key,
+)
+from job_apply_agent.app.v2.schemas import JDProfile, ResumeIntelligence
+
+
+def _jd(tech_stack, domain="backend", seniority="senior"):
+    return JDProfile(company="Acme", role="Engineer", domain=domain, seniority_level=seniority, tech_stack=tech_stack)
+
+
+def _candidate(tech_skills, domain="backend", seniority="senior"):
+    return ResumeIntelligence(name="Sam", domain_focus=domain, seniority_level=seniority, tech_skills=tech_skills)
+
+
+JD_STACK = ["Python", "Django", "PostgreSQL", "Redis", "Kafka"]
+
+
+class RuleDecisionTest(unittest.TestCase):
+    def test_thresholds(self):
+        self.assertEqual(RULE_SKIP_MAX_OVERLAP, 0.2)
+        self.assertEqual(RULE_APPLY_MIN_OVERLAP, 0.6)
+
+    def test_skip_below_skip_boundary(self):
+        decision = _rule_decision(_jd(JD_STACK, domain="data"), _candidate(["Java"]))
+        self.assertEqual((decision.decision, decision.confidence), ("SKIP", "high"))
+
+    def test_no_skip_at_skip_boundary(self):
+        # 1 of 5 is exactly 0.2: not below it, so the LLM decides
+        self.assertIsNone(_rule_decision(_jd(JD_STACK, domain="data"), _candidate(["Python"])))
+
+    def test_apply_at_apply_boundary(self):
+        # 3 of 5 is exactly 0.6
+        decision = _rule_decision(_jd(JD_STACK), _candidate(["Python", "Django", "PostgreSQL"]))
+        self.assertEqual((decision.decision, decision.confidence), ("APPLY", "high"))
+
+    def test_no_apply_below_apply_boundary(self):
+        self.assertIsNone(_rule_decision(_jd(JD_STACK), _candidate(["Python", "Django"])))
+
+    def test_near_miss_spellings_count_as_overlap(self):
+        jd = _jd(["PostgreSQL", "React.js", "Node.js", "Python 3.11", "Kubernetes"], domain="fullstack")
+        candidate = _candidate(["Postgres", "React", "NodeJS", "python3", "k8s"], domain="frontend")
+        # Without normalization this is 0 of 5 and a domain mismatch: a confident SKIP
+        self.assertIsNone(_rule_decision(jd, candidate))
+        decision = _rule_decision(jd, _candidate(["Postgres", "React", "NodeJS", "python3"], domain="fullstack"))
+        self.assertEqual(decision.decision, "APPLY")
+        self.assertIn("PostgreSQL", decision.reasons[1])
+
+
+class TechKeyTest(unittest.TestCase):
+    def test_spellings_of_one_technology_match(self):
+        for a, b in [
+            ("PostgreSQL", "Postgres"),
+            ("React.js", "React"),
+            ("ReactJS", "react"),
+            ("Node.js", "node"),
+            ("JS", "JavaScript"),
+            ("Java 17", "Java"),
+            ("Golang", "Go"),
+            ("scikit-learn", "sklearn"),
+        ]:
+            with self.subTest(a=a, b=b):
+                self.assertEqual(_tech_key(a), _tech_key(b))
+
+    def test_distinct_technologies_stay_apart(self):
+        for a, b in [("C++", "C"), ("C#", "C"), ("S3", "S"), ("EC2", "EC"), ("Java", "JavaScript")]:
+            with self.subTest(a=a, b=b):
+                self.assertNotEqual(_tech_key(a), _tech_key(b))
+
+
+class _FakeResponse:
+    """Stands in for the aiohttp ClientResponse openai 0.28 streams from."""
+
+    def __init__(self):
+        self.closed = False
+
+    def release(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+def _fake_stream(response, arguments):
+    """Async generators nested like openai 0.28's: the response is held two layers in."""
+
+    async def inner(result):
+        for piece in arguments:
+            yield {"choices": [{"delta": {"function_call": {"arguments": piece}}, "finish_reason": None}]}
+
+    async def outer():
+        async for chunk in inner(response):
+            yield chunk
+
+    return outer()
+
+
+class StreamDecisionTest(unittest.IsolatedAsyncioTestCase):
+    async def _stream(self, arguments, escalate_low=False):
+        response = _FakeResponse()
+        stream = _fake_stream(response, arguments)
+        with mock.patch.object(decision_agent, "chat_completion", mock.AsyncMock(return_value=stream)):
+            decision = await _stream_decision("model", "prompt", None, escalate_low)
+        return decision, response
+
+    async def test_early_skip_closes_inner_response(self):
+        decision, response = await self._stream(['{"decision": "SKIP", ', '"confidence": "high", ', '"reasons": []}'])
+        self.assertEqual(decision.blockers, [EARLY_SKIP_NOTE])
+        self.assertTrue(response.closed)
+
+    async def test_low_confidence_escalation_closes_inner_response(self):
+        decision, response = await self._stream(['{"decision": "APPLY", ', '"confidence": "low", ', '"reasons": []}'], True)
+        self.assertIsNone(decision)
+        self.assertTrue(response.closed)
+
+
+if __name__ == "__main__":
+    unittest.main()